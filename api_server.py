@@ -0,0 +1,253 @@
+"""
+Local HTTP API for the mentor pipeline (standard library only).
+
+    python api_server.py --port 8765 --workers 8
+
+Endpoints (JSON responses):
+    GET  /health
+    GET  /metrics                           LLM telemetry, Prometheus text format
+    POST /datasets                          body = CSV / Parquet bytes, ?filename=data.csv
+    GET  /datasets/<fingerprint>            basic info of a loaded dataset
+    GET  /datasets/<fingerprint>/profile
+    GET  /datasets/<fingerprint>/time-series
+    GET  /datasets/<fingerprint>/cleaning
+    GET  /datasets/<fingerprint>/plans?goal=...
+    POST /analyze/<section>?filename=...&goal=...   upload + one section in a single call
+
+Uploads are parsed once per content fingerprint (core.dataset_cache), and
+section results are memoized per fingerprint. CPU-heavy work runs on a
+bounded worker pool; when too many requests are waiting the server answers
+503 instead of queueing without limit.
+"""
+import argparse
+import json
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from core.data_loader import get_basic_info
+from core.data_profiler import detect_time_series, profile_dataset
+from core.dataset_cache import get_cached_dataset, load_dataset_bytes
+from core.pipeline import cleaning_report, plan_project, to_jsonable
+from llm_engine.llm_client import export_llm_metrics
+
+# ===============================
+# SERVER SETTINGS
+# ===============================
+API_HOST = os.getenv("MENTOR_API_HOST", "127.0.0.1")
+API_PORT = int(os.getenv("MENTOR_API_PORT", "8765"))
+API_WORKERS = os.cpu_count() or 4
+API_MAX_PENDING = 64              # queued + running jobs before answering 503
+MAX_UPLOAD_MB = 512
+RESULT_CACHE_ENTRIES = 256
+
+SECTIONS = {
+    "profile": lambda df, goal: profile_dataset(df),
+    "time-series": lambda df, goal: detect_time_series(df),
+    "cleaning": lambda df, goal: cleaning_report(df),
+    "plans": lambda df, goal: plan_project(df, goal),
+}
+
+
+class WorkerPool:
+    """
+    Thread pool with a cap on outstanding jobs.
+    Threads share the in-process dataset / summary caches.
+    """
+
+    def __init__(self, workers=API_WORKERS, max_pending=API_MAX_PENDING):
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="api-worker")
+        self.slots = threading.BoundedSemaphore(max_pending)
+
+    def run(self, fn, *args):
+        """
+        fn(*args) on the pool; None if the pool is saturated.
+        """
+        if not self.slots.acquire(blocking=False):
+            return None
+        try:
+            return (self.executor.submit(fn, *args).result(),)
+        finally:
+            self.slots.release()
+
+
+class ResultCache:
+    """
+    LRU of JSON-ready section results by (fingerprint, section, goal).
+    """
+
+    def __init__(self, max_entries=RESULT_CACHE_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+        return None
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+class ApiError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+# ===============================
+# REQUEST HANDLING
+# ===============================
+class MentorRequestHandler(BaseHTTPRequestHandler):
+    server_version = "MentorAPI/1.0"
+    pool = None
+    results = None
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def _dispatch(self, method):
+        url = urlparse(self.path)
+        parts = [p for p in url.path.split("/") if p]
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+
+        if method == "GET" and parts == ["metrics"]:
+            self._send_text(200, export_llm_metrics())
+            return
+
+        try:
+            if method == "GET" and parts == ["health"]:
+                payload = {"status": "ok"}
+            elif method == "POST" and parts == ["datasets"]:
+                payload = self._upload(query)
+            elif method == "GET" and len(parts) == 2 and parts[0] == "datasets":
+                df = self._dataset(parts[1])
+                payload = {"fingerprint": parts[1], **get_basic_info(df)}
+            elif method == "GET" and len(parts) == 3 and parts[0] == "datasets":
+                payload = self._section(parts[1], parts[2], query.get("goal", ""))
+            elif method == "POST" and len(parts) == 2 and parts[0] == "analyze":
+                fingerprint = self._upload(query)["fingerprint"]
+                payload = self._section(fingerprint, parts[1], query.get("goal", ""))
+            else:
+                raise ApiError(404, f"Unknown endpoint: {method} {url.path}")
+        except ApiError as e:
+            self._send_json(e.status, {"error": str(e)})
+            return
+        except Exception as e:
+            self._send_json(500, {"error": f"{type(e).__name__}: {e}"})
+            return
+
+        self._send_json(200, payload)
+
+    def _on_pool(self, fn, *args):
+        result = self.pool.run(fn, *args)
+        if result is None:
+            raise ApiError(503, "Server busy, retry later")
+        return result[0]
+
+    def _upload(self, query):
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            raise ApiError(400, "Invalid Content-Length")
+        if length <= 0:
+            raise ApiError(411, "Upload body with Content-Length required")
+        if length > MAX_UPLOAD_MB * 1024 * 1024:
+            raise ApiError(413, f"Upload larger than {MAX_UPLOAD_MB} MB")
+
+        data = self.rfile.read(length)
+        filename = query.get("filename") or self.headers.get("X-Filename") or "data.csv"
+        try:
+            df, info = self._on_pool(load_dataset_bytes, data, filename)
+        except ValueError as e:
+            # the loaders report unreadable / oversized CSVs as ValueError
+            raise ApiError(400, str(e))
+
+        return {
+            "fingerprint": info["fingerprint"],
+            "source": info["source"],
+            "rows": df.shape[0],
+            "columns": df.shape[1],
+        }
+
+    def _dataset(self, fingerprint):
+        # a cold entry is read from Parquet: on the pool, like the analysis
+        df = self._on_pool(get_cached_dataset, fingerprint)
+        if df is None:
+            raise ApiError(404, f"Unknown dataset fingerprint: {fingerprint}")
+        return df
+
+    def _section(self, fingerprint, section, goal):
+        if section not in SECTIONS:
+            raise ApiError(404, f"Unknown section: {section}")
+
+        key = (fingerprint, section, goal if section == "plans" else "")
+        cached = self.results.get(key)
+        if cached is not None:
+            return cached
+
+        df = self._dataset(fingerprint)
+        result = to_jsonable(self._on_pool(SECTIONS[section], df, goal))
+        self.results.set(key, result)
+        return result
+
+    def _send_json(self, status, payload):
+        self._send_body(status, json.dumps(payload).encode("utf-8"), "application/json")
+
+    def _send_text(self, status, text):
+        self._send_body(status, text.encode("utf-8"), "text/plain; version=0.0.4")
+
+    def _send_body(self, status, body, content_type):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # keep high request rates quiet
+
+
+def make_server(host=API_HOST, port=API_PORT, workers=API_WORKERS, max_pending=API_MAX_PENDING):
+    handler = type("Handler", (MentorRequestHandler,), {
+        "pool": WorkerPool(workers, max_pending),
+        "results": ResultCache(),
+    })
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default=API_HOST)
+    parser.add_argument("--port", type=int, default=API_PORT)
+    parser.add_argument("--workers", type=int, default=API_WORKERS)
+    parser.add_argument("--max-pending", type=int, default=API_MAX_PENDING)
+    args = parser.parse_args()
+
+    server = make_server(args.host, args.port, args.workers, args.max_pending)
+    print(f"Mentor API listening on http://{args.host}:{args.port} ({args.workers} workers)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
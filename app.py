@@ -1,28 +1,51 @@
 import streamlit as st
 import matplotlib.pyplot as plt
+import pandas as pd
+import uuid
 from io import BytesIO
 
-from core.data_loader import load_csv, get_basic_info
+from core.data_loader import get_basic_info
+from core.dataset_cache import load_dataset
 from core.data_profiler import profile_dataset, detect_time_series
-from core.visualizer import plot_correlation_heatmap, plot_boxplots
-from core.cleaning_guide import get_cleaning_guidance
-from core.model_planner import plan_models
-from core.train_test_guide import get_train_test_guidance
-from core.auto_cleaner import auto_clean_dataframe
+from core.visualizer import get_visualizations
+from core.cleaning_guide import get_cleaning_guidance, stream_cleaning_guidance
+from core.model_planner import plan_models, submit_model_planning_reasoning
+from core.train_test_guide import get_train_test_guidance, submit_train_test_reasoning
+from core.auto_cleaner import plan_encoding
 from core.custom_visualizer import generate_custom_plot
+from core.figure_cache import FigureCache, figure_cache
+from core.exporter import EXPORT_FORMATS, available_formats, export_cleaned, find_export
+from core.stage_graph import StageGraph
 
 from llm_engine.prompts import problem_understanding_prompt
-from llm_engine.llm_client import call_llm
+from llm_engine.llm_client import (
+    export_llm_metrics,
+    get_breaker_state,
+    get_llm_metrics,
+    get_scheduler_stats,
+    submit_llm,
+)
 from llm_engine.response_parser import parse_llm_response
+from llm_engine.scheduler import set_session
 
+from ui.sections import show_llm_telemetry, stream_markdown
 from ui.style import apply_global_style
+from utils.constants import SUPPORTED_FILE_TYPES
 
 # ===============================
 # SESSION STATE
 # ===============================
 st.session_state.setdefault("df", None)
+st.session_state.setdefault("dataset_fingerprint", None)
 st.session_state.setdefault("problem_info", None)
 st.session_state.setdefault("fullscreen_fig", None)
+st.session_state.setdefault("session_id", uuid.uuid4().hex)
+
+# LLM calls of this run count against this session's token budget
+set_session(st.session_state.session_id)
+
+# stages below are memoized on their declared inputs (see core/stage_graph.py)
+graph = StageGraph(st.session_state)
 
 # ===============================
 # HELPERS
@@ -33,13 +56,30 @@ def rotate_axis_labels(fig):
     fig.tight_layout()
 
 
-def render_small(fig, width=420):
+def render_png(fig, dpi=120):
     rotate_axis_labels(fig)
     buf = BytesIO()
-    fig.savefig(buf, format="png", dpi=120, bbox_inches="tight")
+    fig.savefig(buf, format="png", dpi=dpi, bbox_inches="tight")
     plt.close(fig)
-    buf.seek(0)
-    st.image(buf, width=width)
+    return buf.getvalue()
+
+
+def cached_png(build_fig, plot_type, features, width=420, dpi=120):
+    """
+    Rendered PNGs are cached by dataset fingerprint + plot spec,
+    so build_fig() only runs (and savefig only happens) on a miss.
+    """
+    fingerprint = st.session_state.dataset_fingerprint
+
+    if fingerprint is None:
+        return render_png(build_fig(), dpi)
+
+    key = FigureCache.make_key(fingerprint, plot_type, features, width, dpi)
+    return figure_cache.get_or_render(key, lambda: render_png(build_fig(), dpi))
+
+
+def render_small(build_fig, plot_type, features, width=420):
+    st.image(cached_png(build_fig, plot_type, features, width), width=width)
 
 
 def render_fullscreen(fig):
@@ -54,7 +94,7 @@ def render_fullscreen(fig):
 def llm_plot_explanation(plot_type, features):
     """
     LLM explanation for a single plot.
-    Advisory only.
+    Advisory only. Returns a Future (see submit_llm).
     """
     prompt = f"""
 You are a senior data scientist.
@@ -70,7 +110,7 @@ Rules:
 - No bullets
 - No extra text
 """
-    return call_llm(prompt=prompt)
+    return submit_llm(prompt=prompt, site="plot_explanation")
 
 # ===============================
 # PAGE CONFIG
@@ -96,12 +136,33 @@ if st.session_state.fullscreen_fig is not None:
 # DATASET UPLOAD
 # ===============================
 st.markdown("## Dataset Upload")
-uploaded_file = st.file_uploader("Upload a CSV file", type=["csv"])
+uploaded_file = st.file_uploader("Upload a CSV or Parquet file", type=SUPPORTED_FILE_TYPES)
 
 if uploaded_file:
-    st.session_state.df = load_csv(uploaded_file)
+    # parsed once per file content; reruns load the cached columnar copy
+    st.session_state.df, load_info = load_dataset(uploaded_file)
+    st.session_state.dataset_fingerprint = load_info["fingerprint"]
+
+    load_stats = load_info.get("load_stats")
+    if load_stats:
+        st.caption(
+            f"Loaded {load_stats['rows']:,} rows in {load_stats['chunks']} chunks "
+            f"({load_stats['rows_per_second']:,} rows/s, "
+            f"peak ~{load_stats['peak_memory_mb']} MB)"
+        )
     st.dataframe(st.session_state.df.head())
 
+# identity of the loaded data, the main input of every stage
+dataset_key = st.session_state.dataset_fingerprint or id(st.session_state.df)
+
+# ===============================
+# LLM FAN-OUT
+# Independent prompts are submitted up front and collected
+# where they are rendered, so page latency ~ slowest call.
+# (Cleaning guidance is streamed instead, see below.)
+# ===============================
+llm_futures = {}
+
 st.markdown("<div class='section-space'></div>", unsafe_allow_html=True)
 
 # ===============================
@@ -112,18 +173,42 @@ if st.session_state.df is not None:
     goal = st.text_input("Describe what you want to build")
 
     if goal:
-        info = get_basic_info(st.session_state.df)
-        raw = call_llm(problem_understanding_prompt(goal, info), fallback_context=goal)
-        st.session_state.problem_info = parse_llm_response(raw)
+        info = graph.run(
+            "basic_info",
+            lambda: get_basic_info(st.session_state.df),
+            dataset=dataset_key
+        )
+        st.session_state.problem_info = graph.run(
+            "problem_understanding",
+            lambda: parse_llm_response(
+                submit_llm(
+                    problem_understanding_prompt(goal, info),
+                    fallback_context=goal,
+                    site="problem_understanding"
+                ).result()
+            ),
+            dataset=dataset_key,
+            goal=goal
+        )
         st.write(st.session_state.problem_info["reasoning"])
 
+if st.session_state.problem_info is not None:
+    # depend on problem understanding only; start them before the heavy sections
+    problem_version = graph.version("problem_understanding")
+    task_type = st.session_state.problem_info["task_type"]
+
+    if graph.needs_run("train_test", problem=problem_version):
+        llm_futures["train_test"] = submit_train_test_reasoning(task_type, task_type == "time_series")
+    if graph.needs_run("model_plans", problem=problem_version):
+        llm_futures["models"] = submit_model_planning_reasoning(st.session_state.problem_info)
+
 st.markdown("<div class='section-space'></div>", unsafe_allow_html=True)
 
 # ===============================
 # TIME SERIES DETECTION
 # ===============================
 time_info = (
-    detect_time_series(st.session_state.df)
+    graph.run("time_series", lambda: detect_time_series(st.session_state.df), dataset=dataset_key)
     if st.session_state.df is not None
     else {"is_time_series": False}
 )
@@ -134,30 +219,26 @@ time_info = (
 if st.session_state.df is not None:
     st.markdown("## Data Visualization")
 
-    visuals = []
-
-    heatmap = plot_correlation_heatmap(st.session_state.df)
-    if heatmap:
-        visuals.append((
-            "Correlation Heatmap",
-            "sns.heatmap(df.corr())",
-            "numeric feature correlations",
-            heatmap
-        ))
-
-    for fig in plot_boxplots(st.session_state.df):
-        visuals.append((
-            "Boxplot",
-            "sns.boxplot(x=df[column])",
-            "single numeric feature",
-            fig
-        ))
-
-    if visuals:
+    # lazily drawn: only the figure being viewed is built
+    visuals = graph.run(
+        "visualizations",
+        lambda: get_visualizations(st.session_state.df, st.session_state.dataset_fingerprint),
+        dataset=dataset_key
+    )
+
+    if len(visuals):
         idx = st.slider("Browse visualizations", 0, len(visuals) - 1, 0)
-        title, code, feature_context, fig = visuals[idx]
+        st.caption(visuals.title(idx))
+        title, code, feature_context = visuals.describe(idx)
 
-        explanation = llm_plot_explanation(title, feature_context)
+        explanation_stage = f"plot_explanation:{idx}"
+        explanation_future = None
+        if graph.needs_run(explanation_stage, dataset=dataset_key):
+            explanation_future = llm_plot_explanation(title, feature_context)
+
+        png = cached_png(lambda: visuals.figure(idx), "auto", [visuals.title(idx)])
+
+        explanation = graph.run(explanation_stage, lambda: explanation_future.result(), dataset=dataset_key)
         lines = explanation.splitlines() if explanation else ["", ""]
 
         st.markdown("<div class='ml-card'>", unsafe_allow_html=True)
@@ -174,11 +255,11 @@ if st.session_state.df is not None:
             st.write(lines[1] if len(lines) > 1 else "")
 
             if st.button("🔍 View Fullscreen", key=f"fs_auto_{idx}"):
-                st.session_state.fullscreen_fig = fig
+                st.session_state.fullscreen_fig = visuals.figure(idx)
                 st.experimental_rerun()
 
         with right:
-            render_small(fig)
+            st.image(png, width=420)
 
         st.markdown("</div>", unsafe_allow_html=True)
 
@@ -202,7 +283,13 @@ if st.session_state.df is not None:
     else:
         features = [st.selectbox("X-axis", cols), st.selectbox("Y-axis", cols)]
 
-    fig = generate_custom_plot(st.session_state.df, plot_type, features)
+    def build_custom_plot():
+        return generate_custom_plot(
+            st.session_state.df,
+            plot_type,
+            features,
+            fingerprint=st.session_state.dataset_fingerprint
+        )
 
     st.markdown("<div class='ml-card'>", unsafe_allow_html=True)
     left, right = st.columns([1, 1])
@@ -213,11 +300,11 @@ if st.session_state.df is not None:
         st.write("Custom plots help explore specific hypotheses.")
 
         if st.button("🔍 View Fullscreen", key="fs_custom"):
-            st.session_state.fullscreen_fig = fig
+            st.session_state.fullscreen_fig = build_custom_plot()
             st.experimental_rerun()
 
     with right:
-        render_small(fig)
+        render_small(build_custom_plot, plot_type, features)
 
     st.markdown("</div>", unsafe_allow_html=True)
 
@@ -228,7 +315,9 @@ st.markdown("<div class='section-space'></div>", unsafe_allow_html=True)
 # ===============================
 if st.session_state.df is not None:
     st.markdown("## Dataset Health Report")
-    st.dataframe(profile_dataset(st.session_state.df))
+
+    profile = graph.run("profile", lambda: profile_dataset(st.session_state.df), dataset=dataset_key)
+    st.dataframe(profile)
 
 st.markdown("<div class='section-space'></div>", unsafe_allow_html=True)
 
@@ -238,13 +327,43 @@ st.markdown("<div class='section-space'></div>", unsafe_allow_html=True)
 if st.session_state.df is not None:
     st.markdown("## Data Cleaning")
 
-    auto = st.checkbox("Apply automatic cleaning")
+    auto = st.checkbox("Apply automatic cleaning", key="auto_clean")
 
     if auto:
-        cleaned = auto_clean_dataframe(st.session_state.df)
-        st.download_button("Download cleaned CSV", cleaned.to_csv(index=False), "cleaned.csv")
+        plan = graph.run("encoding_plan", lambda: plan_encoding(st.session_state.df), dataset=dataset_key)
+        st.caption(
+            f"Encoded width: {plan['output_width']:,} columns · "
+            f"estimated peak memory: {plan['peak_memory_mb']:,} MB"
+        )
+        if plan["columns"]:
+            st.dataframe(pd.DataFrame(plan["columns"]))
+
+        # the cleaned file is only built when asked for, then reused
+        export_format = st.selectbox("Export format", available_formats(), key="export_format")
+        fingerprint = st.session_state.dataset_fingerprint
+        path = find_export(fingerprint, export_format, plan)
+
+        if path is None and st.button("Prepare cleaned file"):
+            with st.spinner("Cleaning and compressing in chunks..."):
+                path = export_cleaned(st.session_state.df, fingerprint, export_format, plan)
+
+        if path is not None:
+            with open(path, "rb") as f:
+                st.download_button(
+                    f"Download cleaned {export_format}",
+                    f,
+                    f"cleaned.{export_format}",
+                    mime=EXPORT_FORMATS[export_format]
+                )
     else:
-        for step in get_cleaning_guidance(st.session_state.df):
+        def stream_guidance():
+            # show the long answer as it is generated, then the parsed sections
+            live = st.empty()
+            llm_text = stream_markdown(stream_cleaning_guidance(st.session_state.df), placeholder=live)
+            live.empty()
+            return get_cleaning_guidance(st.session_state.df, llm_text=llm_text)
+
+        for step in graph.run("cleaning_guidance", stream_guidance, dataset=dataset_key):
             st.markdown(f"### {step['title']}")
             st.write(step["reason"])
             st.code(step["code"])
@@ -259,9 +378,14 @@ if st.session_state.problem_info is not None:
 
     is_ts = st.session_state.problem_info["task_type"] == "time_series"
 
-    for s in get_train_test_guidance(
-        st.session_state.problem_info["task_type"],
-        is_ts
+    for s in graph.run(
+        "train_test",
+        lambda: get_train_test_guidance(
+            st.session_state.problem_info["task_type"],
+            is_ts,
+            llm_reasoning=llm_futures["train_test"].result()
+        ),
+        problem=graph.version("problem_understanding")
     ):
         st.markdown(f"### {s['title']}")
         st.write(s["why"])
@@ -275,7 +399,31 @@ st.markdown("<div class='section-space'></div>", unsafe_allow_html=True)
 if st.session_state.problem_info is not None:
     st.markdown("## Model Selection")
 
-    for p in plan_models(st.session_state.problem_info):
+    for p in graph.run(
+        "model_plans",
+        lambda: plan_models(
+            st.session_state.problem_info,
+            llm_reasoning=llm_futures["models"].result()
+        ),
+        problem=graph.version("problem_understanding")
+    ):
         st.markdown(f"### {p['title']}")
         st.write(p["reason"])
         st.code(p["model"])
+
+# ===============================
+# STAGE TRACE
+# ===============================
+if graph.trace:
+    with st.expander("Stage trace (ran vs. memoized)"):
+        st.dataframe(pd.DataFrame(graph.trace, columns=["stage", "status", "seconds"]))
+
+# ===============================
+# DEVELOPER PANEL
+# ===============================
+circuit = get_breaker_state()
+if circuit["state"] != "closed":
+    st.sidebar.warning("LLM provider unavailable: showing rule-based guidance until it recovers.")
+
+if st.sidebar.checkbox("Developer panel", key="dev_panel"):
+    show_llm_telemetry(get_llm_metrics(), export_llm_metrics(), get_scheduler_stats(), circuit)
@@ -0,0 +1,103 @@
+"""
+Headless batch run of the mentor pipeline over a directory of CSV files.
+
+Each dataset is analyzed in a worker process (load_csv, profile_dataset,
+detect_time_series, cleaning guidance, train/test guidance, model plans)
+and written to <output>/<name>.json.
+
+    python batch_cli.py data/ --output reports/ --workers 8 --goal "predict churn"
+"""
+import argparse
+import glob
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from core.data_loader import load_csv
+from core.pipeline import analyze_dataframe
+
+
+def analyze_file(path, output_dir, goal=""):
+    """
+    Worker: analyze one CSV and write its JSON report.
+    Never raises; failures are recorded in the report.
+    """
+    name = os.path.splitext(os.path.basename(path))[0]
+    start = time.perf_counter()
+    summary = {"dataset": name, "path": path, "rows": 0, "status": "ok"}
+
+    try:
+        df = load_csv(path)
+        summary["rows"] = len(df)
+        report = analyze_dataframe(df, goal)
+    except Exception as e:
+        summary["status"] = "error"
+        report = {"error": f"{type(e).__name__}: {e}"}
+
+    summary["seconds"] = round(time.perf_counter() - start, 3)
+    report = {"dataset": name, "source": path, "seconds": summary["seconds"], **report}
+
+    with open(os.path.join(output_dir, f"{name}.json"), "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    return summary
+
+
+def run_batch(paths, output_dir, workers=None, goal=""):
+    """
+    Spread datasets across a process pool; returns per-dataset summaries.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    summaries = []
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(analyze_file, path, output_dir, goal) for path in paths]
+
+        for done, future in enumerate(as_completed(futures), start=1):
+            summary = future.result()
+            summaries.append(summary)
+            print(
+                f"[{done}/{len(paths)}] {summary['dataset']}: {summary['status']} "
+                f"({summary['rows']:,} rows, {summary['seconds']:.2f}s)",
+                flush=True
+            )
+
+    return summaries
+
+
+def print_throughput(summaries, wall_seconds, workers):
+    ok = [s for s in summaries if s["status"] == "ok"]
+    rows = sum(s["rows"] for s in ok)
+    busy = sum(s["seconds"] for s in summaries)
+
+    print()
+    print(f"datasets     : {len(summaries)} ({len(ok)} ok, {len(summaries) - len(ok)} failed)")
+    print(f"workers      : {workers}")
+    print(f"wall time    : {wall_seconds:.2f}s")
+    print(f"throughput   : {len(summaries) / wall_seconds:.2f} datasets/s, {rows / wall_seconds:,.0f} rows/s")
+    if summaries:
+        print(f"mean per file: {busy / len(summaries):.2f}s (parallel efficiency {busy / (wall_seconds * workers):.0%})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("input_dir", help="directory containing the CSV files")
+    parser.add_argument("--output", default="reports", help="directory for the JSON reports")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="worker processes")
+    parser.add_argument("--pattern", default="*.csv", help="file name pattern inside input_dir")
+    parser.add_argument("--goal", default="", help="project goal used for problem understanding")
+    args = parser.parse_args()
+
+    paths = sorted(glob.glob(os.path.join(args.input_dir, args.pattern)))
+    if not paths:
+        parser.error(f"no files matching {args.pattern!r} in {args.input_dir}")
+
+    workers = max(1, min(args.workers or 1, len(paths)))
+    start = time.perf_counter()
+    summaries = run_batch(paths, args.output, workers, args.goal)
+    print_throughput(summaries, time.perf_counter() - start, workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Benchmark: vectorized profile_dataset vs. the original per-column loop.
+
+Run from the project root:
+    python -m benchmarks.bench_profile_dataset --rows 20000 --cols 2000
+"""
+import argparse
+import gc
+import time
+import tracemalloc
+
+import pandas as pd
+
+from benchmarks.synthetic import make_dataset
+from core.data_profiler import profile_dataset
+
+
+def profile_dataset_per_column(df):
+    """
+    Original column-by-column implementation (reference output).
+    """
+    report = []
+
+    for col in df.columns:
+        col_data = df[col]
+
+        col_info = {
+            "column": col,
+            "dtype": str(col_data.dtype),
+            "null_count": int(col_data.isnull().sum()),
+            "non_null_count": int(col_data.notnull().sum()),
+            "unique_values": int(col_data.nunique())
+        }
+
+        if pd.api.types.is_numeric_dtype(col_data):
+            q1 = col_data.quantile(0.25)
+            q3 = col_data.quantile(0.75)
+            iqr = q3 - q1
+            lower = q1 - 1.5 * iqr
+            upper = q3 + 1.5 * iqr
+
+            outliers = col_data[(col_data < lower) | (col_data > upper)]
+            col_info["outlier_count"] = int(outliers.count())
+        else:
+            col_info["outlier_count"] = "N/A"
+
+        report.append(col_info)
+
+    return pd.DataFrame(report)
+
+
+def _best_of(fn, df, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        frame = df.copy()   # profile_dataset memoizes per frame object
+        start = time.perf_counter()
+        result = fn(frame)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def _peak_memory_mb(fn, df):
+    frame = df.copy()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        fn(frame)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / 1024 ** 2
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--cols", type=int, default=2_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    # 3/4 numeric (float / int / heavy-tailed), 1/4 low-cardinality text
+    df = make_dataset(args.rows, args.cols, numeric_ratio=0.75, cardinality=3, date_columns=0)
+
+    old_time, expected = _best_of(profile_dataset_per_column, df, args.repeat)
+    new_time, actual = _best_of(profile_dataset, df, args.repeat)
+
+    pd.testing.assert_frame_equal(actual, expected)
+
+    old_peak = _peak_memory_mb(profile_dataset_per_column, df)
+    new_peak = _peak_memory_mb(profile_dataset, df)
+
+    print(f"rows={args.rows} cols={args.cols} ({df.memory_usage(deep=True).sum() / 1024 ** 2:.0f} MB)")
+    print(f"per-column loop : {old_time:.3f}s  peak +{old_peak:.0f} MB")
+    print(f"vectorized      : {new_time:.3f}s  peak +{new_peak:.0f} MB")
+    print(f"speedup         : {old_time / new_time:.1f}x (outputs identical)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+"""
+Micro-benchmark suite for the core stages on synthetic data.
+
+Run from the project root:
+    python -m benchmarks.run_suite --grid small --save-baseline benchmarks/baseline.json
+    python -m benchmarks.run_suite --grid small --baseline benchmarks/baseline.json
+
+Each stage is timed (best of --repeat runs) for every (rows, cols) in the
+grid; peak memory comes from one extra run under tracemalloc. With
+--baseline, any stage slower or hungrier than baseline * (1 + tolerance)
+is reported and the exit code is 1.
+
+benchmarks/baseline.json is the committed reference for the small grid.
+Timings depend on the machine: a CI job should first run the suite with
+--save-baseline on the target branch, on the same runner, and then compare
+the change against that file. Refresh the committed file (same command as
+above) whenever a change makes a stage faster on purpose.
+"""
+import argparse
+import gc
+import json
+import sys
+import time
+import tracemalloc
+
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+
+from benchmarks.synthetic import make_dataset
+from core.auto_cleaner import auto_clean_dataframe
+from core.custom_visualizer import generate_custom_plot
+from core.data_profiler import detect_time_series, profile_dataset
+from core.visualizer import plot_boxplots, plot_correlation_heatmap
+
+GRIDS = {
+    "small": [(5_000, 10), (20_000, 20)],
+    "medium": [(100_000, 20), (100_000, 100)],
+    "large": [(1_000_000, 20), (200_000, 500)],
+}
+DEFAULT_TOLERANCE = 0.25
+MIN_DELTA = {"seconds": 0.005, "peak_mb": 0.5}   # ignore noise on tiny stages
+
+
+def _first(df, prefixes):
+    for col in df.columns:
+        if col.startswith(prefixes):
+            return col
+    return df.columns[0]
+
+
+def _custom_plot(plot_type, prefixes, second=None):
+    def run(df):
+        features = [_first(df, prefixes)]
+        if second:
+            features.append(_first(df, second))
+        return generate_custom_plot(df, plot_type, features)
+    return run
+
+
+STAGES = {
+    "profile_dataset": profile_dataset,
+    "detect_time_series": detect_time_series,
+    "auto_clean_dataframe": auto_clean_dataframe,
+    "plot_boxplots": plot_boxplots,
+    "plot_correlation_heatmap": plot_correlation_heatmap,
+    "custom_histogram": _custom_plot("Histogram", ("float_",)),
+    "custom_boxplot": _custom_plot("Boxplot", ("heavy_", "float_")),
+    "custom_scatter": _custom_plot("Scatter Plot", ("float_",), ("int_",)),
+    "custom_line": _custom_plot("Line Plot", ("int_",), ("float_",)),
+    "custom_count": _custom_plot("Count Plot", ("text_",)),
+}
+
+
+def _call(fn, df):
+    # a fresh copy per run: no per-frame memo carries over between runs
+    frame = df.copy()
+    gc.collect()
+    start = time.perf_counter()
+    fn(frame)
+    elapsed = time.perf_counter() - start
+    plt.close("all")
+    return elapsed
+
+
+def _peak_memory_mb(fn, df):
+    frame = df.copy()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        fn(frame)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+        plt.close("all")
+    return peak / 1024 ** 2
+
+
+def run_suite(grid, repeat=3, stages=None, seed=0):
+    results = {}
+
+    for rows, cols in grid:
+        df = make_dataset(rows, cols, seed=seed)
+
+        for name, fn in STAGES.items():
+            if stages and name not in stages:
+                continue
+
+            seconds = min(_call(fn, df) for _ in range(repeat))
+            results[f"{name}@{rows}x{cols}"] = {
+                "seconds": round(seconds, 4),
+                "peak_mb": round(_peak_memory_mb(fn, df), 2),
+            }
+            print(f"{name:<26} {rows:>9,} x {cols:<5} "
+                  f"{seconds:8.3f}s  {results[f'{name}@{rows}x{cols}']['peak_mb']:9.1f} MB", flush=True)
+
+    return results
+
+
+def compare(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    """
+    Regressions as (key, metric, baseline, current) tuples.
+    """
+    regressions = []
+    for key, current in results.items():
+        if key not in baseline:
+            continue
+        for metric in ("seconds", "peak_mb"):
+            before = baseline[key][metric]
+            after = current[metric]
+            if after > before * (1 + tolerance) and after - before > MIN_DELTA[metric]:
+                regressions.append((key, metric, before, after))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--grid", choices=sorted(GRIDS), default="small")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--stage", action="append", choices=sorted(STAGES), help="only these stages")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--baseline", help="JSON results to compare against")
+    parser.add_argument("--save-baseline", help="write the results to this JSON file")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    args = parser.parse_args()
+
+    results = run_suite(GRIDS[args.grid], args.repeat, args.stage, args.seed)
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+        print(f"\nbaseline written to {args.save_baseline}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+
+        regressions = compare(results, baseline, args.tolerance)
+        print()
+        if not regressions:
+            print(f"no regressions (tolerance {args.tolerance:.0%})")
+            return
+
+        for key, metric, before, after in regressions:
+            change = f"{after / before - 1:+.0%}" if before else "new cost"
+            print(f"REGRESSION {key} {metric}: {before} -> {after} ({change})")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+Seeded synthetic datasets for the benchmarks.
+"""
+import numpy as np
+import pandas as pd
+
+
+def make_dataset(
+    rows,
+    cols,
+    numeric_ratio=0.6,
+    missing_rate=0.05,
+    cardinality=20,
+    date_columns=1,
+    seed=0,
+):
+    """
+    Mixed-dtype frame with `cols` columns:
+    - `date_columns` ISO date strings (what a CSV upload looks like)
+    - numeric_ratio of the rest numeric (float / int / heavy-tailed)
+    - the remainder text categories drawn from `cardinality` labels
+    A fraction missing_rate of float and text values is missing.
+    The same arguments always give the same frame.
+    """
+    rng = np.random.default_rng(seed)
+    data = {}
+
+    for i in range(min(date_columns, cols)):
+        start = np.datetime64("2015-01-01") + int(rng.integers(0, 365))
+        dates = start + np.sort(rng.integers(0, 3650, rows)).astype("timedelta64[D]")
+        data[f"date_{i}"] = pd.Series(dates).dt.strftime("%Y-%m-%d")
+
+    remaining = cols - len(data)
+    numeric_cols = int(round(remaining * numeric_ratio))
+    labels = np.array([f"cat_{j}" for j in range(max(cardinality, 1))], dtype=object)
+
+    for i in range(remaining):
+        if i < numeric_cols:
+            kind = i % 3
+            if kind == 0:
+                values = rng.normal(100, 15, rows)
+                values[rng.random(rows) < missing_rate] = np.nan
+                data[f"float_{i}"] = values
+            elif kind == 1:
+                data[f"int_{i}"] = rng.integers(0, 1000, rows)
+            else:
+                data[f"heavy_{i}"] = rng.standard_cauchy(rows)
+        else:
+            # Zipf-like label frequencies, as in real categorical data
+            weights = 1.0 / np.arange(1, len(labels) + 1)
+            values = rng.choice(labels, rows, p=weights / weights.sum())
+            values[rng.random(rows) < missing_rate] = None
+            data[f"text_{i}"] = values
+
+    return pd.DataFrame(data)
@@ -0,0 +1,134 @@
+import matplotlib.dates as mdates
+import numpy as np
+import pandas as pd
+from scipy.stats import gaussian_kde
+
+# ===============================
+# AGGREGATION-FIRST PLOTS
+# Rows are reduced to quantiles / bin counts / category counts first;
+# drawing cost then scales with bins, not rows.
+# ===============================
+HIST_MAX_BINS = 100
+KDE_SAMPLE_SIZE = 5_000
+KDE_GRID_POINTS = 200
+COUNT_TOP_K = 20
+OTHER_LABEL = "Other"
+
+
+def draw_boxplot_from_stats(ax, stats, label):
+    """
+    Horizontal boxplot from precomputed stats (q1, median, q3,
+    whislo, whishi, fliers), as produced by numeric_summary.
+    """
+    ax.bxp(
+        [{
+            "q1": stats["q1"],
+            "med": stats["median"],
+            "q3": stats["q3"],
+            "whislo": stats["whislo"],
+            "whishi": stats["whishi"],
+            "fliers": stats["fliers"],
+        }],
+        vert=False,
+        showfliers=True,
+        patch_artist=True,
+        boxprops={"facecolor": "#4c72b0", "alpha": 0.8},
+        medianprops={"color": "black"},
+        flierprops={"marker": "d", "markersize": 4},
+    )
+    ax.set_yticks([])
+    ax.set_xlabel(label)
+
+    if len(stats["fliers"]) < stats["outliers"]:
+        ax.text(
+            0.99, 0.01,
+            f"{stats['outliers']:,} outliers, {len(stats['fliers']):,} shown",
+            transform=ax.transAxes,
+            ha="right",
+            va="bottom",
+            fontsize=6,
+            alpha=0.7,
+        )
+
+
+def draw_histogram(ax, series, max_bins=HIST_MAX_BINS, kde_sample_size=KDE_SAMPLE_SIZE):
+    """
+    Histogram from NumPy-binned counts with a KDE fitted on a sample,
+    scaled to the count axis like sns.histplot(kde=True).
+    Datetime columns are binned as int64 nanoseconds on a date axis.
+    """
+    is_datetime = pd.api.types.is_datetime64_any_dtype(series)
+    if is_datetime:
+        stamps = series.dropna()
+        if stamps.dt.tz is not None:
+            stamps = stamps.dt.tz_convert(None)
+        values = stamps.to_numpy(dtype="datetime64[ns]").astype(np.int64).astype(np.float64)
+    else:
+        values = series.dropna().to_numpy(dtype=np.float64)
+    values = values[np.isfinite(values)]
+
+    def x(points):
+        # nanoseconds -> matplotlib date numbers for datetime columns
+        if not is_datetime:
+            return points
+        return mdates.date2num(np.asarray(points).astype(np.int64).astype("datetime64[ns]"))
+    ax.set_xlabel(series.name)
+    ax.set_ylabel("Count")
+    if not len(values):
+        return
+
+    edges = np.histogram_bin_edges(values, bins="auto")
+    if len(edges) - 1 > max_bins:
+        edges = np.histogram_bin_edges(values, bins=max_bins)
+    counts, edges = np.histogram(values, bins=edges)
+
+    ax.stairs(counts, x(edges), fill=True, alpha=0.6, color="#4c72b0")
+    ax.stairs(counts, x(edges), color="#4c72b0")
+    if is_datetime:
+        ax.xaxis_date()
+
+    if len(values) > kde_sample_size:
+        sample = np.random.default_rng(0).choice(values, kde_sample_size, replace=False)
+    else:
+        sample = values
+
+    try:
+        kde = gaussian_kde(sample)
+    except (np.linalg.LinAlgError, ValueError):
+        return  # constant or single-valued column: no density to draw
+
+    grid = np.linspace(edges[0], edges[-1], KDE_GRID_POINTS)
+    bin_width = (edges[-1] - edges[0]) / len(counts)
+    ax.plot(x(grid), kde(grid) * len(values) * bin_width, color="#4c72b0")
+
+
+def draw_top_k_counts(ax, series, k=COUNT_TOP_K):
+    """
+    Bar chart of the k most frequent values plus one "Other" bar
+    for everything else.
+    """
+    counts = series.value_counts()
+    top = counts.iloc[:k]
+    labels = [str(value) for value in top.index]
+    heights = top.to_list()
+
+    rest = int(counts.iloc[k:].sum())
+    if rest:
+        labels.append(f"{OTHER_LABEL} ({len(counts) - k:,})")
+        heights.append(rest)
+
+    bars = ax.bar(range(len(heights)), heights, color="#4c72b0")
+    if rest:
+        bars[-1].set_color("#999999")
+
+    ax.set_xticks(range(len(heights)))
+    ax.set_xticklabels(labels)
+    ax.set_xlabel(series.name)
+    ax.set_ylabel("count")
+
+
+def is_binnable(series):
+    """
+    Numeric (non-bool) columns can be histogrammed / boxplotted from aggregates.
+    """
+    return pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series)
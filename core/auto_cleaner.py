@@ -1,16 +1,308 @@
+import numpy as np
 import pandas as pd
-from sklearn.preprocessing import StandardScaler
-def auto_clean_dataframe(df):
-    df = df.copy()
-    # Handle missing values
-    for col in df.select_dtypes(include=["int64", "float64"]).columns:
-        df[col].fillna(df[col].median(), inplace=True)
-    for col in df.select_dtypes(include=["object"]).columns:
-        df[col].fillna(df[col].mode()[0], inplace=True)
-    # One-hot encoding
-    df = pd.get_dummies(df, drop_first=True)
-    # Feature scaling
-    scaler = StandardScaler()
-    numeric_cols = df.select_dtypes(include=["int64", "float64"]).columns
-    df[numeric_cols] = scaler.fit_transform(df[numeric_cols])
-    return df
+
+from core.sketches import QuantileSketch
+
+# ===============================
+# CARDINALITY-AWARE ENCODING
+# ===============================
+ONE_HOT_MAX_CATEGORIES = 20       # at most this many categories -> sparse one-hot
+HASHING_MIN_CATEGORIES = 1_000    # more than this -> hashing, in between -> frequency
+HASH_BUCKETS = 64
+SPARSE_BYTES_PER_ROW = 5          # one stored value + int32 index per row
+
+
+def plan_encoding(df):
+    """
+    Choose an encoding per categorical column from its cardinality and
+    estimate the output width and peak memory, before anything is built.
+    Returns {"columns": [...], "output_width": int, "peak_memory_mb": float}.
+    """
+    rows = len(df)
+    input_bytes = int(df.memory_usage(index=True, deep=True).sum())
+    categorical = df.select_dtypes(include=["object", "category"]).columns
+
+    columns = []
+    output_width = df.shape[1] - len(categorical)
+    output_bytes = 8 * rows * output_width
+
+    for col in categorical:
+        unique = int(df[col].nunique())
+
+        if unique <= ONE_HOT_MAX_CATEGORIES:
+            strategy, width = "one_hot", max(unique - 1, 0)   # drop_first
+            col_bytes = SPARSE_BYTES_PER_ROW * rows
+        elif unique <= HASHING_MIN_CATEGORIES:
+            strategy, width = "frequency", 1
+            col_bytes = 8 * rows
+        else:
+            strategy, width = "hashing", HASH_BUCKETS
+            col_bytes = SPARSE_BYTES_PER_ROW * rows
+
+        columns.append({
+            "column": col,
+            "unique_values": unique,
+            "strategy": strategy,
+            "output_columns": width,
+        })
+        output_width += width
+        output_bytes += col_bytes
+
+    # the working copy and the encoded output are alive together
+    peak_bytes = 2 * input_bytes + output_bytes
+
+    return {
+        "columns": columns,
+        "output_width": output_width,
+        "peak_memory_mb": round(peak_bytes / 1024 ** 2, 2),
+    }
+
+
+def _hash_encode(values, col, buckets=HASH_BUCKETS):
+    hashes = pd.util.hash_pandas_object(values.astype(str), index=False).to_numpy()
+    codes = (hashes % np.uint64(buckets)).astype(np.int64)
+    codes = np.where(values.isna().to_numpy(), -1, codes)
+
+    bucket_ids = pd.Categorical.from_codes(codes, categories=range(buckets))
+    return pd.get_dummies(bucket_ids, prefix=f"{col}_hash", sparse=True).set_index(values.index)
+
+
+# ===============================
+# FIT / TRANSFORM CLEANING PIPELINE
+# ===============================
+MEDIAN_SAMPLE_SIZE = 16_384       # per-column quantile sketch (exact below this)
+VOCAB_TRACK_MAX = 4 * HASHING_MIN_CATEGORIES
+
+
+def _iter_frames(source):
+    if isinstance(source, pd.DataFrame):
+        yield source
+    else:
+        yield from source
+
+
+def _mode(counts):
+    """
+    Most frequent value; ties resolve like Series.mode()[0] (smallest value).
+    """
+    top = counts[counts == counts.max()].index
+    try:
+        return sorted(top)[0]
+    except TypeError:
+        return top[0]
+
+
+class CleaningPipeline:
+    """
+    Auto-cleaning split into fit and transform.
+
+    fit() makes one streaming pass over a DataFrame or an iterable of
+    chunks and keeps only per-column state: fill values (median / mode),
+    category counts and shifted sums for scaling. transform() then cleans
+    any chunk with those statistics, so large data never needs a full
+    cleaned copy in memory.
+
+    Scaling matches StandardScaler (population std, constant columns
+    get scale 1). Medians come from a quantile sketch when the data is
+    streamed, and are exact when fit() is given a whole DataFrame.
+    """
+
+    def __init__(self, strategies=None, median_sample_size=MEDIAN_SAMPLE_SIZE):
+        self.strategies = dict(strategies or {})
+        self.median_sample_size = median_sample_size
+        self.rows = 0
+        self.columns = []
+        self._numeric = {}
+        self._categorical = {}
+        self._fitted = False
+
+    # ---------- fit ----------
+    def partial_fit(self, chunk):
+        for col in chunk.columns:
+            if col in self.columns:
+                continue
+            self.columns.append(col)
+            col_data = chunk[col]
+            if pd.api.types.is_numeric_dtype(col_data) and not pd.api.types.is_bool_dtype(col_data):
+                shift = col_data.mean()
+                self._numeric[col] = {
+                    "count": 0,
+                    "shift": 0.0 if pd.isna(shift) else float(shift),
+                    "sum": 0.0,
+                    "sum_sq": 0.0,
+                    "sketch": QuantileSketch(self.median_sample_size, seed=len(self.columns)),
+                }
+            elif col_data.dtype == object or isinstance(col_data.dtype, pd.CategoricalDtype):
+                self._categorical[col] = {"counts": pd.Series(dtype="int64"), "overflow": False}
+                if isinstance(col_data.dtype, pd.CategoricalDtype):
+                    # get_dummies keeps the declared category order
+                    self._categorical[col]["categories"] = list(col_data.cat.categories)
+
+        for col, state in self._numeric.items():
+            if col not in chunk:
+                continue
+            values = chunk[col].to_numpy(dtype="float64", na_value=np.nan)
+            values = values[~np.isnan(values)] - state["shift"]
+            state["count"] += len(values)
+            state["sum"] += float(values.sum())
+            state["sum_sq"] += float(np.dot(values, values))
+            state["sketch"].add(pd.Series(values + state["shift"]))
+
+        for col, state in self._categorical.items():
+            if col not in chunk:
+                continue
+            if "categories" in state:
+                if isinstance(chunk[col].dtype, pd.CategoricalDtype):
+                    # chunks parsed separately can each declare other categories
+                    known = set(state["categories"])
+                    state["categories"] += [c for c in chunk[col].cat.categories if c not in known]
+                else:
+                    # chunks disagree on the dtype: vocabulary from the counts
+                    del state["categories"]
+            counts = state["counts"].add(chunk[col].value_counts(), fill_value=0).astype("int64")
+            if len(counts) > VOCAB_TRACK_MAX:
+                # heavy hitters only: the column will be hashed anyway
+                counts = counts.nlargest(VOCAB_TRACK_MAX)
+                state["overflow"] = True
+            state["counts"] = counts
+
+        self.rows += len(chunk)
+        self._fitted = False
+        return self
+
+    def fit(self, source):
+        """
+        source: a DataFrame or an iterable of DataFrame chunks.
+        """
+        for chunk in _iter_frames(source):
+            self.partial_fit(chunk)
+
+        exact_medians = None
+        if isinstance(source, pd.DataFrame):
+            exact_medians = source[list(self._numeric)].median()
+
+        self._finalize(exact_medians)
+        return self
+
+    def _finalize(self, exact_medians=None):
+        rows = max(self.rows, 1)
+
+        for col, state in self._numeric.items():
+            if exact_medians is not None:
+                median = exact_medians[col]
+            else:
+                median = state["sketch"].quantile(0.5)
+            fill = 0.0 if pd.isna(median) else float(median)
+
+            # statistics of the filled column, from the shifted sums
+            nulls = self.rows - state["count"]
+            delta = fill - state["shift"]
+            mean_shifted = (state["sum"] + nulls * delta) / rows
+            variance = (state["sum_sq"] + nulls * delta * delta) / rows - mean_shifted ** 2
+            std = np.sqrt(max(variance, 0.0))
+
+            state.update({
+                "fill": fill,
+                "mean": state["shift"] + mean_shifted,
+                "scale": std if std > 0 else 1.0,
+            })
+
+        for col, state in self._categorical.items():
+            counts = state["counts"]
+            state["fill"] = _mode(counts) if len(counts) else None
+
+            strategy = self.strategies.get(col)
+            if strategy is None:
+                if state["overflow"] or len(counts) > HASHING_MIN_CATEGORIES:
+                    strategy = "hashing"
+                elif len(counts) > ONE_HOT_MAX_CATEGORIES:
+                    strategy = "frequency"
+                else:
+                    strategy = "one_hot"
+            state["strategy"] = strategy
+
+            if strategy == "one_hot" and "categories" in state:
+                state["vocabulary"] = state["categories"]
+            elif strategy == "one_hot":
+                try:
+                    state["vocabulary"] = sorted(counts.index)
+                except TypeError:
+                    state["vocabulary"] = list(counts.index)
+            elif strategy == "frequency":
+                filled_counts = counts.copy()
+                if state["fill"] is not None:
+                    filled_counts[state["fill"]] += self.rows - int(counts.sum())
+                frequencies = filled_counts / rows
+                mean = float((frequencies * filled_counts).sum() / rows)
+                variance = float((frequencies ** 2 * filled_counts).sum() / rows) - mean ** 2
+                std = np.sqrt(max(variance, 0.0))
+                state.update({
+                    "frequencies": frequencies,
+                    "mean": mean,
+                    "scale": std if std > 0 else 1.0,
+                })
+
+        self._fitted = True
+
+    # ---------- transform ----------
+    def transform(self, chunk):
+        if not self._fitted:
+            self._finalize()
+
+        out = {}
+        one_hot = []
+        hashed = []
+
+        for col in chunk.columns:
+            col_data = chunk[col]
+
+            if col in self._numeric:
+                state = self._numeric[col]
+                values = col_data.astype("float64").fillna(state["fill"])
+                out[col] = (values - state["mean"]) / state["scale"]
+
+            elif col in self._categorical:
+                state = self._categorical[col]
+                filled = col_data if state["fill"] is None else col_data.fillna(state["fill"])
+
+                if state["strategy"] == "one_hot":
+                    one_hot.append(pd.get_dummies(
+                        pd.Categorical(filled, categories=state["vocabulary"]),
+                        prefix=col,
+                        drop_first=True,
+                        sparse=True
+                    ).set_index(chunk.index))
+                elif state["strategy"] == "frequency":
+                    frequency = filled.map(state["frequencies"]).astype("float64").fillna(0.0)
+                    out[col] = (frequency - state["mean"]) / state["scale"]
+                else:
+                    hashed.append(_hash_encode(filled, col))
+
+            else:
+                out[col] = col_data
+
+        parts = [pd.DataFrame(out, index=chunk.index)] + one_hot + hashed
+        return pd.concat(parts, axis=1) if len(parts) > 1 else parts[0]
+
+    def transform_chunks(self, source, chunk_rows=500_000):
+        """
+        Cleaned chunks of a DataFrame (row slices) or of an iterable of chunks.
+        """
+        if isinstance(source, pd.DataFrame):
+            frame = source
+            source = (frame.iloc[start:start + chunk_rows] for start in range(0, len(frame), chunk_rows))
+        for chunk in source:
+            yield self.transform(chunk)
+
+
+def auto_clean_dataframe(df, plan=None):
+    """
+    Median / mode filling, cardinality-aware encoding and standard
+    scaling, via CleaningPipeline. plan (see plan_encoding) fixes the
+    encoding per column.
+    """
+    strategies = None
+    if plan is not None:
+        strategies = {entry["column"]: entry["strategy"] for entry in plan["columns"]}
+
+    return CleaningPipeline(strategies).fit(df).transform(df)
@@ -1,4 +1,4 @@
-from llm_engine.llm_client import call_llm
+from llm_engine.llm_client import call_llm, stream_llm, submit_llm
 from llm_engine.prompts import CLEANING_GUIDE_PROMPT
 import json
 
@@ -53,18 +53,39 @@ def _split_sections(text):
     return sections
 
 
-def get_cleaning_guidance(df, session_state=None):
+def _build_cleaning_prompt(df):
+    digest = _build_profile_digest(df)
+    return CLEANING_GUIDE_PROMPT + "\n\nCOLUMN_METADATA:\n" + json.dumps(digest, indent=2)
+
+
+def submit_cleaning_guidance(df):
+    """
+    Start the cleaning-guidance LLM call in the background.
+    Pass future.result() to get_cleaning_guidance(llm_text=...).
+    """
+    return submit_llm(_build_cleaning_prompt(df), fallback_context="", site="cleaning_guidance")
+
+
+def stream_cleaning_guidance(df):
+    """
+    Yield the cleaning-guidance LLM text as it is generated.
+    Pass the joined text to get_cleaning_guidance(llm_text=...).
+    """
+    return stream_llm(_build_cleaning_prompt(df), fallback_context="", site="cleaning_guidance")
+
+
+def get_cleaning_guidance(df, session_state=None, llm_text=None):
     if df is None:
         return []
 
-    digest = _build_profile_digest(df)
-
-    llm_text = call_llm(
-        prompt=CLEANING_GUIDE_PROMPT + "\n\nCOLUMN_METADATA:\n" + json.dumps(digest, indent=2),
-        fallback_context="",
-        cache_key="cleaning_no_outliers",
-        session_state=session_state,
-    )
+    if llm_text is None:
+        llm_text = call_llm(
+            prompt=_build_cleaning_prompt(df),
+            fallback_context="",
+            cache_key="cleaning_no_outliers",
+            session_state=session_state,
+            site="cleaning_guidance",
+        )
 
     if not llm_text:
         return [
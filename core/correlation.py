@@ -0,0 +1,149 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+from scipy.cluster.hierarchy import leaves_list, linkage
+from scipy.spatial.distance import squareform
+
+# ===============================
+# CORRELATION ENGINE (WIDE DATASETS)
+# ===============================
+CORR_BLOCK_COLUMNS = 512          # columns per block of the pairwise matrix
+CORR_CACHE_ENTRIES = 8            # matrices kept per process (by fingerprint)
+HEATMAP_MAX_COLUMNS = 40
+ANNOTATE_MAX_COLUMNS = 12
+TOP_K_PAIRS = 20
+
+_matrices = OrderedDict()
+_matrices_lock = threading.Lock()
+
+
+def _pairwise_block(x_a, m_a, x_b, m_b):
+    """
+    Pearson r over pairwise-complete rows, like DataFrame.corr().
+    x_* hold centered values with NaN set to 0, m_* the 0/1 valid masks.
+    """
+    n = m_a.T @ m_b
+    sum_a = x_a.T @ m_b
+    sum_b = m_a.T @ x_b
+    sum_ab = x_a.T @ x_b
+    sum_aa = (x_a * x_a).T @ m_b
+    sum_bb = m_a.T @ (x_b * x_b)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        cov = n * sum_ab - sum_a * sum_b
+        var_a = n * sum_aa - sum_a * sum_a
+        var_b = n * sum_bb - sum_b * sum_b
+        r = cov / np.sqrt(var_a * var_b)
+
+    r[(n < 2) | (var_a <= 0) | (var_b <= 0)] = np.nan
+    return np.clip(r, -1.0, 1.0)
+
+
+def _compute_correlation(numeric_df, block_columns):
+    values = numeric_df.to_numpy(dtype="float64", na_value=np.nan)
+    mask = ~np.isnan(values)
+
+    # centering first keeps the sums small (less cancellation)
+    counts = np.maximum(mask.sum(axis=0), 1)
+    means = np.where(mask, values, 0.0).sum(axis=0) / counts
+    centered = np.where(mask, values - means, 0.0)
+    mask = mask.astype(np.float64)
+
+    cols = values.shape[1]
+    corr = np.empty((cols, cols))
+
+    for i in range(0, cols, block_columns):
+        a = slice(i, i + block_columns)
+        for j in range(i, cols, block_columns):
+            b = slice(j, j + block_columns)
+            block = _pairwise_block(centered[:, a], mask[:, a], centered[:, b], mask[:, b])
+            corr[a, b] = block
+            corr[b, a] = block.T
+
+    # a column is perfectly correlated with itself whenever r is defined
+    diagonal = np.diag(corr).copy()
+    np.fill_diagonal(corr, np.where(np.isnan(diagonal), np.nan, 1.0))
+
+    return pd.DataFrame(corr, index=numeric_df.columns, columns=numeric_df.columns)
+
+
+def correlation_matrix(df, fingerprint=None, block_columns=CORR_BLOCK_COLUMNS):
+    """
+    Pairwise Pearson correlation of the numeric columns.
+    Built block by block (bounded temporaries for wide tables) and
+    cached per dataset fingerprint when one is given.
+    """
+    if fingerprint is not None:
+        with _matrices_lock:
+            if fingerprint in _matrices:
+                _matrices.move_to_end(fingerprint)
+                return _matrices[fingerprint]
+
+    corr = _compute_correlation(df.select_dtypes(include="number"), block_columns)
+
+    if fingerprint is not None:
+        with _matrices_lock:
+            _matrices[fingerprint] = corr
+            _matrices.move_to_end(fingerprint)
+            while len(_matrices) > CORR_CACHE_ENTRIES:
+                _matrices.popitem(last=False)
+
+    return corr
+
+
+def top_correlated_pairs(corr, k=TOP_K_PAIRS):
+    """
+    The k strongest pairs (by |r|) as a DataFrame
+    with feature_1, feature_2 and correlation.
+    """
+    rows, cols = np.triu_indices(len(corr), k=1)
+    values = corr.to_numpy()[rows, cols]
+
+    valid = ~np.isnan(values)
+    rows, cols, values = rows[valid], cols[valid], values[valid]
+
+    if len(values) > k:
+        keep = np.argpartition(-np.abs(values), k - 1)[:k]
+        rows, cols, values = rows[keep], cols[keep], values[keep]
+
+    order = np.argsort(-np.abs(values), kind="stable")
+    return pd.DataFrame({
+        "feature_1": corr.index[rows[order]],
+        "feature_2": corr.columns[cols[order]],
+        "correlation": values[order],
+    })
+
+
+def cluster_order(corr):
+    """
+    Column order from average-linkage clustering on 1 - |r|,
+    so correlated features sit next to each other.
+    """
+    if len(corr) < 3:
+        return list(corr.columns)
+
+    distance = 1.0 - np.abs(np.nan_to_num(corr.to_numpy(), nan=0.0))
+    np.fill_diagonal(distance, 0.0)
+    distance = (distance + distance.T) / 2
+
+    tree = linkage(squareform(distance, checks=False), method="average")
+    return [corr.columns[i] for i in leaves_list(tree)]
+
+
+def heatmap_view(corr, max_columns=HEATMAP_MAX_COLUMNS):
+    """
+    Capped, cluster-ordered matrix for display.
+    Above max_columns only the columns with the strongest
+    correlations to any other column are kept.
+    """
+    if len(corr) > max_columns:
+        strength = np.nan_to_num(np.abs(corr.to_numpy()), nan=0.0)
+        np.fill_diagonal(strength, 0.0)
+        best = strength.max(axis=1)
+        keep = np.sort(np.argsort(-best, kind="stable")[:max_columns])
+        corr = corr.iloc[keep, keep]
+
+    order = cluster_order(corr)
+    return corr.loc[order, order]
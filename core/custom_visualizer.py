@@ -1,18 +1,107 @@
 import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
 import seaborn as sns
-def generate_custom_plot(df, plot_type, features):
+
+from core.aggregate_plots import (
+    draw_boxplot_from_stats,
+    draw_histogram,
+    draw_top_k_counts,
+    is_binnable,
+)
+from core.correlation import correlation_matrix
+from core.data_profiler import column_box_stats
+from core.decimation import (
+    DECIMATION_THRESHOLD,
+    HEXBIN_GRIDSIZE,
+    SCATTER_SAMPLE_POINTS,
+    annotate_decimation,
+    decimate_line,
+)
+from core.visualizer import draw_correlation_heatmap
+
+
+def _scatter(df, x_col, y_col, ax, threshold):
+    x, y = df[x_col], df[y_col]
+    points = len(df)
+
+    if points <= threshold:
+        sns.scatterplot(x=x, y=y, ax=ax)
+        return
+
+    numeric = all(
+        pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values)
+        for values in (x, y)
+    )
+
+    if numeric:
+        # density binning: cost scales with the grid, not the rows
+        valid = x.notna() & y.notna()
+        hb = ax.hexbin(x[valid], y[valid], gridsize=HEXBIN_GRIDSIZE, mincnt=1, cmap="viridis")
+        ax.figure.colorbar(hb, ax=ax, label="count")
+        ax.set_xlabel(x_col)
+        ax.set_ylabel(y_col)
+        annotate_decimation(ax, points, f"hexbin density, gridsize {HEXBIN_GRIDSIZE}")
+    else:
+        sample_size = min(points, SCATTER_SAMPLE_POINTS)
+        rows = np.random.default_rng(0).choice(points, sample_size, replace=False)
+        sns.scatterplot(x=x.iloc[rows], y=y.iloc[rows], ax=ax)
+        annotate_decimation(ax, points, f"{sample_size:,} points, random sample")
+
+
+def _line(df, x_col, y_col, ax, threshold):
+    points = len(df)
+
+    if points <= threshold:
+        # mean per x without the bootstrap confidence band (seconds per plot)
+        sns.lineplot(x=df[x_col], y=df[y_col], errorbar=None, ax=ax)
+        return
+
+    x, y, method = decimate_line(df[x_col], df[y_col])
+    # already aggregated: no bootstrap confidence interval
+    sns.lineplot(x=x.to_numpy(), y=y.to_numpy(), errorbar=None, ax=ax)
+    ax.set_xlabel(x_col)
+    ax.set_ylabel(y_col)
+    annotate_decimation(ax, points, f"{len(x):,} points, {method}")
+
+
+def _histogram(df, col, ax):
+    if is_binnable(df[col]) or pd.api.types.is_datetime64_any_dtype(df[col]):
+        draw_histogram(ax, df[col])
+    else:
+        draw_top_k_counts(ax, df[col])
+
+
+def _boxplot(df, col, ax):
+    stats = column_box_stats(df, col)
+    if stats is not None and stats["count"]:
+        draw_boxplot_from_stats(ax, stats, col)
+    else:
+        sns.boxplot(x=df[col], ax=ax)
+
+
+def _correlation_heatmap(df, ax, fingerprint):
+    corr = correlation_matrix(df, fingerprint)
+    if corr.shape[1] < 2:
+        ax.text(0.5, 0.5, "Needs at least two numeric columns", ha="center", va="center")
+        ax.axis("off")
+        return
+    draw_correlation_heatmap(ax, corr)
+
+
+def generate_custom_plot(df, plot_type, features, decimate_threshold=DECIMATION_THRESHOLD, fingerprint=None):
     fig, ax = plt.subplots(figsize=(5, 3))
     if plot_type == "Histogram":
-        sns.histplot(df[features[0]], kde=True, ax=ax)
+        _histogram(df, features[0], ax)
     elif plot_type == "Boxplot":
-        sns.boxplot(x=df[features[0]], ax=ax)
+        _boxplot(df, features[0], ax)
     elif plot_type == "Scatter Plot":
-        sns.scatterplot(x=df[features[0]], y=df[features[1]], ax=ax)
+        _scatter(df, features[0], features[1], ax, decimate_threshold)
     elif plot_type == "Line Plot":
-        sns.lineplot(x=df[features[0]], y=df[features[1]], ax=ax)
+        _line(df, features[0], features[1], ax, decimate_threshold)
     elif plot_type == "Count Plot":
-        sns.countplot(x=df[features[0]], ax=ax)
+        draw_top_k_counts(ax, df[features[0]])
     elif plot_type == "Correlation Heatmap":
-        sns.heatmap(df.corr(), annot=True, cmap="coolwarm", ax=ax)
+        _correlation_heatmap(df, ax, fingerprint)
     ax.set_title(plot_type)
     return fig
@@ -1,4 +1,17 @@
+import time
+
 import pandas as pd
+from pandas.api.types import union_categoricals
+
+# ===============================
+# CHUNKED INGESTION SETTINGS
+# ===============================
+SAMPLE_ROWS = 10_000              # leading rows used for dtype inference
+CHUNK_ROWS = 200_000
+MEMORY_LIMIT_MB = 2048            # ceiling for the parsed frame
+CATEGORY_MAX_UNIQUE_RATIO = 0.5   # object column -> category if repetitive
+CATEGORY_MAX_UNIQUE = 1000
+CHUNKED_THRESHOLD_MB = 100        # uploads above this use load_csv_chunked
 
 
 def load_csv(file):
@@ -13,6 +26,149 @@ def load_csv(file):
         raise ValueError("Unable to read the CSV file")
 
 
+def infer_dtypes(sample):
+    """
+    Infer compact dtypes from a leading sample.
+    Integers are narrowed, repetitive text becomes categorical.
+    Floats are narrowed only on request (float32 loses precision).
+    """
+    dtypes = {}
+
+    for col in sample.columns:
+        col_data = sample[col]
+
+        if pd.api.types.is_integer_dtype(col_data):
+            dtypes[col] = str(pd.to_numeric(col_data, downcast="integer").dtype)
+
+        elif pd.api.types.is_float_dtype(col_data):
+            dtypes[col] = "float64"
+
+        elif pd.api.types.is_object_dtype(col_data):
+            non_null = col_data.dropna()
+            unique = non_null.nunique()
+            if (
+                len(non_null) > 0
+                and unique <= CATEGORY_MAX_UNIQUE
+                and unique / len(non_null) <= CATEGORY_MAX_UNIQUE_RATIO
+            ):
+                dtypes[col] = "category"
+
+    return dtypes
+
+
+def _frame_bytes(df):
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+def _combine_chunks(chunks, category_cols):
+    """
+    Concatenate chunks, unioning per-chunk categories
+    (plain concat would fall back to object dtype).
+    """
+    if len(chunks) == 1:
+        return chunks[0]
+
+    categoricals = {
+        col: union_categoricals([chunk[col] for chunk in chunks], ignore_order=True)
+        for col in category_cols
+    }
+
+    df = pd.concat(
+        [chunk.drop(columns=category_cols) for chunk in chunks],
+        ignore_index=True
+    )
+
+    for col, values in categoricals.items():
+        df[col] = pd.Categorical(values)
+
+    return df[chunks[0].columns]
+
+
+def load_csv_chunked(
+    file,
+    chunk_rows=CHUNK_ROWS,
+    memory_limit_mb=MEMORY_LIMIT_MB,
+    sample_rows=SAMPLE_ROWS,
+    downcast_floats=False,
+):
+    """
+    Memory-bounded CSV loading for large files.
+    Dtypes are inferred from a leading sample, the rest is read in chunks.
+    Returns (df, stats) with rows/second and peak memory.
+    Raises ValueError if the file is unreadable or exceeds memory_limit_mb.
+    """
+    start = time.perf_counter()
+    limit_bytes = memory_limit_mb * 1024 * 1024
+
+    try:
+        sample = pd.read_csv(file, nrows=sample_rows)
+        if hasattr(file, "seek"):
+            file.seek(0)
+
+        dtypes = infer_dtypes(sample)
+        if downcast_floats:
+            dtypes.update({col: "float32" for col, dt in dtypes.items() if dt == "float64"})
+
+        category_cols = [col for col, dt in dtypes.items() if dt == "category"]
+        narrow_cols = {col: dt for col, dt in dtypes.items() if dt != "category"}
+
+        chunks = []
+        held_bytes = 0
+        peak_bytes = 0
+
+        reader = pd.read_csv(
+            file,
+            dtype={col: "category" for col in category_cols},
+            chunksize=chunk_rows
+        )
+
+        for chunk in reader:
+            # narrow per chunk: a later NaN or a wider value simply widens
+            # this chunk, and concat upcasts to the common dtype
+            for col, dt in narrow_cols.items():
+                if col not in chunk:
+                    continue
+                if pd.api.types.is_integer_dtype(chunk[col]):
+                    chunk[col] = pd.to_numeric(chunk[col], downcast="integer")
+                elif dt == "float32" and pd.api.types.is_float_dtype(chunk[col]):
+                    chunk[col] = chunk[col].astype("float32")
+
+            chunks.append(chunk)
+            held_bytes += _frame_bytes(chunk)
+            peak_bytes = max(peak_bytes, held_bytes)
+
+            if held_bytes > limit_bytes:
+                raise MemoryError
+
+        if not chunks:
+            df = sample
+        else:
+            df = _combine_chunks(chunks, category_cols)
+            # chunks and the combined frame are alive together during concat
+            peak_bytes = max(peak_bytes, held_bytes + _frame_bytes(df))
+
+    except MemoryError:
+        raise ValueError(
+            f"The CSV file exceeds the {memory_limit_mb} MB memory limit"
+        )
+    except Exception:
+        raise ValueError("Unable to read the CSV file")
+
+    elapsed = max(time.perf_counter() - start, 1e-9)
+
+    stats = {
+        "rows": int(df.shape[0]),
+        "chunks": len(chunks),
+        "seconds": round(elapsed, 3),
+        "rows_per_second": int(df.shape[0] / elapsed),
+        "peak_memory_mb": round(peak_bytes / 1024 / 1024, 2),
+        "memory_mb": round(_frame_bytes(df) / 1024 / 1024, 2),
+        "dtypes": dtypes,
+    }
+
+    return df, stats
+
+
 def get_basic_info(df):
     """
     Return basic dataset information.
@@ -1,13 +1,210 @@
+import math
+import warnings
+import weakref
+from functools import lru_cache
+
 import pandas as pd
 import numpy as np
 
+try:
+    from pandas.tseries.api import guess_datetime_format
+except ImportError:  # pandas < 2.2 (same function, before it was made public)
+    from pandas._libs.tslibs.parsing import guess_datetime_format
+
+from core.sketches import HyperLogLog, QuantileSketch
 from llm_engine.llm_client import call_llm
 
 
+PROFILE_BLOCK_COLUMNS = 256   # numeric columns per vectorized block, at most
+PROFILE_BLOCK_BYTES = 64 * 1024 ** 2   # float64 copy of one block; peak is ~4x this
+BOX_MAX_FLIERS = 200          # outlier points kept per column for boxplots
+
+
+def _is_plain_numeric(col_data):
+    """
+    NumPy float / int columns that survive a float64 cast exactly
+    (vectorized path). Bool, nullable extension dtypes and huge
+    integers keep the per-column path.
+    """
+    dtype = col_data.dtype
+    if not isinstance(dtype, np.dtype) or dtype.kind not in "iuf":
+        return False
+    if dtype.kind in "iu" and dtype.itemsize == 8 and len(col_data):
+        return bool(col_data.abs().max() < 2 ** 53)
+    return True
+
+
+def _column_outlier_count(col_data):
+    q1 = col_data.quantile(0.25)
+    q3 = col_data.quantile(0.75)
+    iqr = q3 - q1
+    lower = q1 - 1.5 * iqr
+    upper = q3 + 1.5 * iqr
+
+    outliers = col_data[(col_data < lower) | (col_data > upper)]
+    return int(outliers.count())
+
+
+def _sorted_quantile(sorted_values, valid_counts, q):
+    """
+    Per-column quantile of a column-sorted 2-D array (NaN sorted last).
+    Mirrors NumPy's "linear" method used by Series.quantile, including
+    its interpolation formula, so results are bit-identical.
+    """
+    position = (valid_counts - 1) * q
+    previous = np.floor(position).astype(np.int64).clip(min=0)
+    following = np.minimum(previous + 1, np.maximum(valid_counts - 1, 0))
+    weight = position - previous
+    cols = np.arange(sorted_values.shape[1])
+
+    low_values = sorted_values[previous, cols]
+    high_values = sorted_values[following, cols]
+    diff = high_values - low_values
+
+    with np.errstate(invalid="ignore"):
+        result = np.where(
+            weight >= 0.5,
+            high_values - diff * (1 - weight),
+            low_values + diff * weight
+        )
+
+    return np.where(valid_counts > 0, result, np.nan)
+
+
+def _capped_fliers(low, high, max_fliers):
+    """
+    Evenly spaced subset of the sorted outliers, always keeping the extremes.
+    """
+    fliers = np.concatenate([low, high])
+    if len(fliers) > max_fliers:
+        fliers = fliers[np.linspace(0, len(fliers) - 1, max_fliers).astype(np.int64)]
+    return fliers
+
+
+def _block_width(rows, block_columns=PROFILE_BLOCK_COLUMNS, block_bytes=PROFILE_BLOCK_BYTES):
+    """
+    Columns per block so one float64 block stays within block_bytes.
+    """
+    return max(1, min(block_columns, block_bytes // (max(rows, 1) * 8)))
+
+
+def _numeric_block_stats(df, columns=None, block_columns=PROFILE_BLOCK_COLUMNS, max_fliers=BOX_MAX_FLIERS):
+    """
+    Unique counts, quartiles, IQR outliers and boxplot whiskers for the
+    given numeric columns of df (default: all). One sort per block of
+    columns replaces per-column nunique / quantile; blocks are sized by
+    PROFILE_BLOCK_BYTES, so long frames get narrower blocks.
+    """
+    stats = {}
+    columns = list(df.columns if columns is None else columns)
+    block_columns = _block_width(len(df), block_columns)
+
+    for start in range(0, len(columns), block_columns):
+        block = columns[start:start + block_columns]
+        values = df[block].to_numpy(dtype="float64", na_value=np.nan)
+
+        if values.shape[0] == 0:
+            stats.update({col: {"unique": 0, "outliers": 0, "count": 0} for col in block})
+            continue
+
+        sorted_values = np.sort(values, axis=0)
+        valid_counts = (~np.isnan(values)).sum(axis=0)
+
+        q1 = _sorted_quantile(sorted_values, valid_counts, 0.25)
+        median = _sorted_quantile(sorted_values, valid_counts, 0.5)
+        q3 = _sorted_quantile(sorted_values, valid_counts, 0.75)
+        iqr = q3 - q1
+        lower = q1 - 1.5 * iqr
+        upper = q3 + 1.5 * iqr
+
+        # NaN compares False on both sides, like the Series mask
+        below = (values < lower).sum(axis=0)
+        above = (values > upper).sum(axis=0)
+        outliers = below + above
+
+        # whiskers: most extreme values still inside the fences
+        cols = np.arange(len(block))
+        last_valid = np.maximum(valid_counts - 1, 0)
+        whislo = sorted_values[np.minimum(below, last_valid), cols]
+        whishi = sorted_values[np.maximum(valid_counts - above - 1, 0), cols]
+
+        # distinct values = value changes between neighbours in sorted order
+        row_index = np.arange(1, values.shape[0])[:, None]
+        changes = (sorted_values[1:] != sorted_values[:-1]) & (row_index < valid_counts)
+        uniques = np.where(valid_counts > 0, changes.sum(axis=0) + 1, 0)
+
+        for i, col in enumerate(block):
+            count = int(valid_counts[i])
+            stats[col] = {"unique": int(uniques[i]), "outliers": int(outliers[i]), "count": count}
+            if count:
+                stats[col].update({
+                    "q1": float(q1[i]),
+                    "median": float(median[i]),
+                    "q3": float(q3[i]),
+                    "whislo": float(whislo[i]),
+                    "whishi": float(whishi[i]),
+                    "fliers": _capped_fliers(
+                        sorted_values[:below[i], i],
+                        sorted_values[count - above[i]:count, i],
+                        max_fliers
+                    ),
+                })
+
+    return stats
+
+
+# Summaries are keyed by frame identity: loaded datasets are not mutated
+# in place, so the health report and the plots share one computation.
+_summaries = {}
+
+
+def numeric_summary(df):
+    """
+    {column: stats} for the plain numeric columns of df (see
+    _numeric_block_stats). Computed once per DataFrame object.
+    """
+    key = id(df)
+    entry = _summaries.get(key)
+    if entry is not None and entry[0]() is df:
+        return entry[1]
+
+    numeric_cols = [col for col in df.columns if _is_plain_numeric(df[col])]
+    summary = _numeric_block_stats(df, numeric_cols)
+    _summaries[key] = (weakref.ref(df, lambda _: _summaries.pop(key, None)), summary)
+    return summary
+
+
+def column_box_stats(df, col):
+    """
+    Boxplot stats for one numeric column: taken from numeric_summary
+    when available, otherwise computed for that column alone.
+    None for non-numeric columns.
+    """
+    summary = numeric_summary(df)
+    if col in summary:
+        return summary[col]
+
+    col_data = df[col]
+    if not pd.api.types.is_numeric_dtype(col_data):
+        return None
+    return _numeric_block_stats(col_data.astype("float64").to_frame())[col]
+
+
 def profile_dataset(df):
     """
     Create a health report of the dataset.
+    Null / unique counts, quartiles and IQR outliers of numeric
+    columns come from one sort per block of columns, not per column.
     """
+    rows = len(df)
+
+    numeric_stats = numeric_summary(df)
+
+    # column by column: a whole-frame isnull() / nunique() would copy the frame
+    null_counts = {col: int(df[col].isnull().sum()) for col in df.columns}
+    unique_counts = {col: df[col].nunique() for col in df.columns if col not in numeric_stats}
+    unique_counts.update({col: stats["unique"] for col, stats in numeric_stats.items()})
+
     report = []
 
     for col in df.columns:
@@ -16,22 +213,175 @@ def profile_dataset(df):
         col_info = {
             "column": col,
             "dtype": str(col_data.dtype),
-            "null_count": int(col_data.isnull().sum()),
-            "non_null_count": int(col_data.notnull().sum()),
-            "unique_values": int(col_data.nunique())
+            "null_count": int(null_counts[col]),
+            "non_null_count": int(rows - null_counts[col]),
+            "unique_values": int(unique_counts[col])
+        }
+
+        if col in numeric_stats:
+            col_info["outlier_count"] = numeric_stats[col]["outliers"]
+        elif pd.api.types.is_numeric_dtype(col_data):
+            col_info["outlier_count"] = _column_outlier_count(col_data)
+        else:
+            col_info["outlier_count"] = "N/A"
+
+        report.append(col_info)
+
+    return pd.DataFrame(report)
+
+
+# ==================================================
+# APPROXIMATE PROFILING (SKETCHES, ONE PASS OVER CHUNKS)
+# ==================================================
+APPROX_CHUNK_ROWS = 500_000
+APPROX_SAMPLE_SIZE = 16_384       # quantile sketch per numeric column (~1% rank error)
+APPROX_HLL_PRECISION = 14         # ~0.8% distinct-count standard error
+APPROX_CONFIDENCE = 0.95
+
+
+def _iter_chunks(source, chunk_rows):
+    """
+    DataFrame -> row slices; iterables of DataFrames pass through.
+    """
+    if isinstance(source, pd.DataFrame):
+        for start in range(0, len(source), chunk_rows):
+            yield source.iloc[start:start + chunk_rows]
+    else:
+        yield from source
+
+
+def _new_approx_state(dtype, hll_precision):
+    return {
+        "dtype": dtype,
+        "rows": 0,
+        "nulls": 0,
+        "hll": HyperLogLog(hll_precision),
+        "quantiles": None,
+    }
+
+
+def _approx_outlier_count(sketch, non_null, confidence):
+    """
+    (estimate, error) of the IQR-rule outlier count from a quantile sketch.
+
+    On the DKW event (probability >= confidence) every sample rank is
+    within eps of the truth, so the true quartiles lie between the sample
+    quantiles at 0.25 +/- eps and 0.75 +/- eps. That brackets both fences;
+    the true outlier fraction is then between the sample fractions outside
+    the widest and the narrowest fences, each off by at most 2 * eps.
+    The error is the larger distance from the estimate to those ends.
+    """
+    eps = sketch.rank_error(confidence)
+
+    def fences(q1, q3):
+        iqr = q3 - q1
+        return q1 - 1.5 * iqr, q3 + 1.5 * iqr
+
+    def q(level):
+        return sketch.quantile(min(max(level, 0.0), 1.0))
+
+    lower, upper = fences(q(0.25), q(0.75))
+    estimate = sketch.fraction_outside(lower, upper)
+
+    # fence = 2.5 * q_a - 1.5 * q_b: extremes pair opposite ends of the quartile ranges
+    q1_lo, q1_hi = q(0.25 - eps), q(0.25 + eps)
+    q3_lo, q3_hi = q(0.75 - eps), q(0.75 + eps)
+    widest = (2.5 * q1_lo - 1.5 * q3_hi, 2.5 * q3_hi - 1.5 * q1_lo)
+    narrowest = (2.5 * q1_hi - 1.5 * q3_lo, 2.5 * q3_lo - 1.5 * q1_hi)
+
+    low = max(sketch.fraction_outside(*widest) - 2 * eps, 0.0)
+    high = min(sketch.fraction_outside(*narrowest) + 2 * eps, 1.0)
+    error = max(estimate - low, high - estimate, 0.0)
+
+    return int(round(estimate * non_null)), int(math.ceil(error * non_null))
+
+
+def profile_dataset_approx(
+    source,
+    chunk_rows=APPROX_CHUNK_ROWS,
+    sample_size=APPROX_SAMPLE_SIZE,
+    hll_precision=APPROX_HLL_PRECISION,
+    confidence=APPROX_CONFIDENCE,
+):
+    """
+    Bounded-memory health report for data larger than memory.
+    `source` is a DataFrame or any iterable of DataFrame chunks
+    (e.g. pd.read_csv(path, chunksize=...)). A frame already in memory
+    is profiled faster and exactly by profile_dataset.
+    Null counts are exact; unique values use HyperLogLog and outliers
+    use a quantile sketch. Each value has a *_error column holding its
+    error bound at the given confidence.
+    """
+    columns = {}
+    order = []
+    z = 2.0  # ~95% for the HLL normal approximation
+
+    if isinstance(source, pd.DataFrame):
+        # every column is reported, even when there are no rows to read
+        for col, dtype in source.dtypes.items():
+            order.append(col)
+            columns[col] = _new_approx_state(dtype, hll_precision)
+
+    for chunk in _iter_chunks(source, chunk_rows):
+        for col in chunk.columns:
+            col_data = chunk[col]
+
+            if col not in columns:
+                order.append(col)
+                columns[col] = _new_approx_state(col_data.dtype, hll_precision)
+            state = columns[col]
+
+            if state["dtype"] != col_data.dtype:
+                # e.g. int chunk followed by a chunk with NaN -> float
+                try:
+                    state["dtype"] = np.result_type(state["dtype"], col_data.dtype)
+                except TypeError:
+                    state["dtype"] = np.dtype("object")
+
+            state["rows"] += len(col_data)
+            state["nulls"] += int(col_data.isnull().sum())
+            state["hll"].add(col_data)
+
+            if pd.api.types.is_numeric_dtype(col_data) and not pd.api.types.is_bool_dtype(col_data):
+                if state["quantiles"] is None:
+                    state["quantiles"] = QuantileSketch(sample_size, seed=len(order))
+                state["quantiles"].add(col_data)
+
+    report = []
+
+    for col in order:
+        state = columns[col]
+        non_null = state["rows"] - state["nulls"]
+        hll = state["hll"]
+        unique = int(round(hll.estimate())) if non_null else 0
+
+        col_info = {
+            "column": col,
+            "dtype": str(state["dtype"]),
+            "null_count": state["nulls"],
+            "non_null_count": non_null,
+            "unique_values": min(unique, non_null),
+            "null_count_error": 0,
+            "unique_values_error": int(math.ceil(z * hll.relative_error * unique)),
         }
 
-        if pd.api.types.is_numeric_dtype(col_data):
-            q1 = col_data.quantile(0.25)
-            q3 = col_data.quantile(0.75)
-            iqr = q3 - q1
-            lower = q1 - 1.5 * iqr
-            upper = q3 + 1.5 * iqr
+        sketch = state["quantiles"]
+        numeric = (
+            pd.api.types.is_numeric_dtype(state["dtype"])
+            and not pd.api.types.is_bool_dtype(state["dtype"])
+        )
 
-            outliers = col_data[(col_data < lower) | (col_data > upper)]
-            col_info["outlier_count"] = int(outliers.count())
+        if numeric and sketch is not None:
+            col_info["outlier_count"], col_info["outlier_count_error"] = _approx_outlier_count(
+                sketch, non_null, confidence
+            )
+        elif numeric:
+            # no rows read: nothing can be an outlier
+            col_info["outlier_count"] = 0
+            col_info["outlier_count_error"] = 0
         else:
             col_info["outlier_count"] = "N/A"
+            col_info["outlier_count_error"] = "N/A"
 
         report.append(col_info)
 
@@ -41,18 +391,92 @@ def profile_dataset(df):
 # ==================================================
 # TIME SERIES DETECTION (RULE-BASED + OPTIONAL LLM)
 # ==================================================
+DATETIME_MIN_PARSED = 0.8        # share of parsable values to call a column datetime
+DATETIME_SAMPLE_SIZE = 200
+DATETIME_SAMPLE_MIN_PARSED = 0.5  # below this on the sample, skip the full parse
+
+DATETIME_FORMAT_CACHE_SIZE = 1024
+
+
+@lru_cache(maxsize=DATETIME_FORMAT_CACHE_SIZE)
+def _guess_format(value):
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", UserWarning)
+        return guess_datetime_format(value)
+
+
+def _first_value_format(values):
+    """
+    Format pandas itself would infer (from the first non-null string).
+    """
+    values = pd.Series(values)
+    present = values.notnull().to_numpy()
+    if not present.any():
+        return None
+
+    first = values.iloc[int(present.argmax())]
+    if not isinstance(first, str):
+        return None
+    return _guess_format(first)
+
+
+def _parse_datetimes(values, fmt):
+    with warnings.catch_warnings():
+        # no inferable format -> dateutil per element (same as before)
+        warnings.simplefilter("ignore", UserWarning)
+        if fmt:
+            return pd.to_datetime(values, format=fmt, errors="coerce")
+        return pd.to_datetime(values, errors="coerce")
+
+
+def _is_datetime_column(col_data):
+    """
+    Sample-first datetime detection.
+    Numeric / bool columns are never dates; categoricals parse their
+    categories only; text columns parse a small sample first and only
+    promising ones get a full, format-specified parse.
+    """
+    if pd.api.types.is_datetime64_any_dtype(col_data):
+        return col_data.notnull().mean() > DATETIME_MIN_PARSED
+
+    if (
+        pd.api.types.is_numeric_dtype(col_data)
+        or pd.api.types.is_bool_dtype(col_data)
+        or pd.api.types.is_timedelta64_dtype(col_data)
+    ):
+        return False
+
+    if len(col_data) == 0:
+        return False
+
+    fmt = _first_value_format(col_data)
+
+    if isinstance(col_data.dtype, pd.CategoricalDtype):
+        categories = _parse_datetimes(pd.Series(col_data.cat.categories), fmt)
+        codes = col_data.cat.codes.to_numpy()
+        parsed_ok = np.append(categories.notnull().to_numpy(), False)[codes]
+        return parsed_ok.mean() > DATETIME_MIN_PARSED
+
+    if len(col_data) > DATETIME_SAMPLE_SIZE:
+        sample = col_data.sample(DATETIME_SAMPLE_SIZE, random_state=0)
+        if _parse_datetimes(sample, fmt).notnull().mean() < DATETIME_SAMPLE_MIN_PARSED:
+            return False
+
+    return _parse_datetimes(col_data, fmt).notnull().mean() > DATETIME_MIN_PARSED
+
+
 def detect_time_series(df, session_state=None):
     """
     Detects whether dataset is time-series.
     Uses cheap rules first, then optional LLM reasoning (metadata only).
+    Datetime columns: text / categorical columns where > 80% of values parse.
     """
 
     # ---------- Rule-based checks ----------
     datetime_cols = []
     for col in df.columns:
         try:
-            parsed = pd.to_datetime(df[col], errors="coerce")
-            if parsed.notnull().mean() > 0.8:
+            if _is_datetime_column(df[col]):
                 datetime_cols.append(col)
         except Exception:
             pass
@@ -87,7 +511,7 @@ Answer strictly as JSON:
 }}
 """
 
-        raw = call_llm(prompt)
+        raw = call_llm(prompt, site="time_series_check")
         session_state["time_series_check"] = raw
 
         # advisory only
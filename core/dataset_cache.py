@@ -0,0 +1,177 @@
+import hashlib
+import io
+import os
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+from core.data_loader import load_csv, load_csv_chunked, CHUNKED_THRESHOLD_MB
+from utils.constants import CACHE_DIR
+from utils.helpers import is_parquet_file
+
+# ===============================
+# CONTENT-ADDRESSED DATASET CACHE
+# ===============================
+DATASET_CACHE_DIR = os.path.join(CACHE_DIR, "datasets")
+MEMORY_CACHE_ENTRIES = 4          # parsed frames kept in this process
+DISK_CACHE_MAX_MB = 2048          # Parquet copies on disk (least recently used removed first)
+FINGERPRINT_ENTRIES = 256         # upload ids remembered in this process
+
+_frames = OrderedDict()
+_frames_lock = threading.Lock()
+_fingerprints = OrderedDict()     # upload id -> fingerprint (skip re-hashing)
+
+
+def fingerprint_bytes(data):
+    """
+    Content fingerprint of the raw uploaded bytes.
+    """
+    return hashlib.sha256(data).hexdigest()
+
+
+def _parquet_path(fingerprint):
+    return os.path.join(DATASET_CACHE_DIR, f"{fingerprint}.parquet")
+
+
+def _remember(fingerprint, df):
+    with _frames_lock:
+        _frames[fingerprint] = df
+        _frames.move_to_end(fingerprint)
+        while len(_frames) > MEMORY_CACHE_ENTRIES:
+            _frames.popitem(last=False)
+
+
+def _write_parquet(fingerprint, df):
+    """
+    Store the parsed frame once; never fails the upload.
+    """
+    path = _parquet_path(fingerprint)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+    try:
+        os.makedirs(DATASET_CACHE_DIR, exist_ok=True)
+        df.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, path)
+    except Exception:
+        # e.g. mixed-type object columns Arrow cannot represent
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return
+
+    _enforce_disk_cap(keep=path)
+
+
+def _enforce_disk_cap(keep=None):
+    """
+    Remove least recently used Parquet files until the directory fits
+    DISK_CACHE_MAX_MB. `keep` (the file just written) is never removed.
+    """
+    entries = []
+    total = 0
+
+    try:
+        for entry in os.scandir(DATASET_CACHE_DIR):
+            if entry.name.endswith(".parquet"):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total += stat.st_size
+    except OSError:
+        return
+
+    for _, size, path in sorted(entries):
+        if total <= DISK_CACHE_MAX_MB * 1024 * 1024:
+            break
+        if path == keep:
+            continue
+        try:
+            os.remove(path)
+            total -= size
+        except OSError:
+            pass
+
+
+def get_cached_dataset(fingerprint):
+    """
+    Parsed dataset for a fingerprint, or None if it was never loaded.
+    """
+    with _frames_lock:
+        if fingerprint in _frames:
+            _frames.move_to_end(fingerprint)
+            return _frames[fingerprint]
+
+    path = _parquet_path(fingerprint)
+    if os.path.exists(path):
+        try:
+            df = pd.read_parquet(path)
+            os.utime(path)  # mark as recently used
+        except Exception:
+            return None
+        _remember(fingerprint, df)
+        return df
+
+    return None
+
+
+def load_dataset_bytes(data, filename="data.csv"):
+    """
+    Parse raw CSV / Parquet bytes once per content fingerprint.
+    Returns (df, info) where info has the fingerprint, where the frame
+    came from (memory / parquet / parsed) and any chunked-load stats.
+    """
+    fingerprint = fingerprint_bytes(data)
+    return _load(fingerprint, data, filename)
+
+
+def load_dataset(uploaded_file):
+    """
+    Streamlit upload -> (df, info), see load_dataset_bytes.
+    Reruns and other sessions with the same file skip CSV parsing.
+    """
+    upload_id = getattr(uploaded_file, "file_id", None)
+    with _frames_lock:
+        fingerprint = _fingerprints.get(upload_id) if upload_id else None
+
+    data = uploaded_file.getvalue()
+    if fingerprint is None:
+        fingerprint = fingerprint_bytes(data)
+        if upload_id:
+            with _frames_lock:
+                _fingerprints[upload_id] = fingerprint
+                while len(_fingerprints) > FINGERPRINT_ENTRIES:
+                    _fingerprints.popitem(last=False)
+
+    return _load(fingerprint, data, uploaded_file.name)
+
+
+def _load(fingerprint, data, filename):
+    info = {"fingerprint": fingerprint}
+
+    with _frames_lock:
+        df = _frames.get(fingerprint)
+        if df is not None:
+            _frames.move_to_end(fingerprint)
+    if df is not None:
+        info["source"] = "memory"
+        return df, info
+
+    df = get_cached_dataset(fingerprint)
+    if df is not None:
+        info["source"] = "parquet"
+        return df, info
+
+    if is_parquet_file(filename):
+        try:
+            df = pd.read_parquet(io.BytesIO(data))
+        except Exception:
+            raise ValueError("Unable to read the Parquet file")
+    elif len(data) > CHUNKED_THRESHOLD_MB * 1024 * 1024:
+        df, stats = load_csv_chunked(io.BytesIO(data))
+        info["load_stats"] = stats
+    else:
+        df = load_csv(io.BytesIO(data))
+
+    info["source"] = "parsed"
+    _write_parquet(fingerprint, df)
+    _remember(fingerprint, df)
+    return df, info
@@ -0,0 +1,101 @@
+import numpy as np
+import pandas as pd
+
+# ===============================
+# POINT DECIMATION FOR LARGE PLOTS
+# ===============================
+DECIMATION_THRESHOLD = 20_000     # points above which line / scatter plots decimate (both paths ~equal here)
+LINE_TARGET_POINTS = 2_000
+SCATTER_SAMPLE_POINTS = 5_000     # non-numeric scatter falls back to sampling
+HEXBIN_GRIDSIZE = 60
+
+
+def lttb(x, y, n_out):
+    """
+    Largest-Triangle-Three-Buckets downsampling.
+    x must be sorted ascending. Returns indices of the kept points;
+    the first and last points are always kept.
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    kept = np.empty(n_out, dtype=np.int64)
+    kept[0] = 0
+    kept[-1] = n - 1
+    previous = 0
+
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+
+        # average of the next bucket is the third triangle vertex
+        next_start = end
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+
+        bucket_x = x[start:end]
+        bucket_y = y[start:end]
+        area = np.abs(
+            (x[previous] - avg_x) * (bucket_y - y[previous])
+            - (x[previous] - bucket_x) * (avg_y - y[previous])
+        )
+
+        previous = start + int(np.argmax(area))
+        kept[i + 1] = previous
+
+    return kept
+
+
+def _as_sortable_numbers(values):
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values.astype("int64").to_numpy()
+    return values.to_numpy(dtype=np.float64)
+
+
+def decimate_line(x, y, target_points=LINE_TARGET_POINTS):
+    """
+    Reduce a line series to about target_points points.
+    Repeated x values are first averaged (what sns.lineplot draws),
+    then LTTB keeps the shape of the curve.
+    Returns (x, y, method).
+    """
+    data = pd.DataFrame({"x": x.to_numpy(), "y": y.to_numpy()}).dropna()
+
+    numeric_x = pd.api.types.is_numeric_dtype(data["x"]) or pd.api.types.is_datetime64_any_dtype(data["x"])
+    numeric_y = pd.api.types.is_numeric_dtype(data["y"])
+
+    if not numeric_y:
+        sample = data.sample(min(target_points, len(data)), random_state=0)
+        return sample["x"], sample["y"], "random sample"
+
+    line = data.groupby("x", sort=numeric_x)["y"].mean()
+
+    if len(line) <= target_points:
+        return pd.Series(line.index), pd.Series(line.to_numpy()), "mean per x"
+
+    if not numeric_x:
+        keep = np.linspace(0, len(line) - 1, target_points).astype(np.int64)
+        return pd.Series(line.index[keep]), pd.Series(line.to_numpy()[keep]), "mean per x, strided"
+
+    keep = lttb(_as_sortable_numbers(pd.Series(line.index)), line.to_numpy(), target_points)
+    return pd.Series(line.index[keep]), pd.Series(line.to_numpy()[keep]), "mean per x, LTTB"
+
+
+def annotate_decimation(ax, original_points, summary):
+    """
+    Mark a plot as decimated, e.g. "decimated: 2,000,000 rows → 2,000 points, LTTB".
+    """
+    ax.text(
+        0.99, 0.01,
+        f"decimated: {original_points:,} rows → {summary}",
+        transform=ax.transAxes,
+        ha="right",
+        va="bottom",
+        fontsize=6,
+        alpha=0.7,
+    )
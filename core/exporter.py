@@ -0,0 +1,187 @@
+import gzip
+import hashlib
+import io
+import json
+import os
+import threading
+import time
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from core.auto_cleaner import CleaningPipeline
+from utils.constants import CACHE_DIR
+
+try:
+    import zstandard
+except ImportError:  # optional: zstd export is offered only when installed
+    zstandard = None
+
+# ===============================
+# STREAMING EXPORT OF CLEANED DATA
+# ===============================
+EXPORT_DIR = os.path.join(CACHE_DIR, "exports")
+EXPORT_CHUNK_ROWS = 100_000
+EXPORT_MAX_AGE_SECONDS = 24 * 3600   # unused exports older than this are removed
+EXPORT_DIR_MAX_MB = 2048             # then least recently used ones beyond this
+EXPORT_FORMATS = {
+    "csv.gz": "application/gzip",
+    "csv.zst": "application/zstd",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+_export_lock = threading.Lock()
+
+
+def available_formats():
+    return [fmt for fmt in EXPORT_FORMATS if fmt != "csv.zst" or zstandard is not None]
+
+
+def export_path(fingerprint, config, fmt):
+    """
+    Output file for a dataset fingerprint + cleaning config + format.
+    """
+    payload = json.dumps([fingerprint, config, fmt], sort_keys=True, default=str)
+    key = hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    return os.path.join(EXPORT_DIR, f"cleaned-{key}.{fmt}")
+
+
+def _dense(chunk):
+    sparse_cols = [col for col in chunk.columns if isinstance(chunk[col].dtype, pd.SparseDtype)]
+    if not sparse_cols:
+        return chunk
+    chunk = chunk.copy()
+    for col in sparse_cols:
+        chunk[col] = chunk[col].sparse.to_dense()
+    return chunk
+
+
+def _write_csv(chunks, raw):
+    text = io.TextIOWrapper(raw, encoding="utf-8", newline="")
+    for i, chunk in enumerate(chunks):
+        _dense(chunk).to_csv(text, header=i == 0, index=False)
+    text.flush()
+    text.detach()
+
+
+def _write_parquet(chunks, path):
+    writer = None
+    try:
+        for chunk in chunks:
+            chunk = _dense(chunk)
+            if writer is None:
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                writer = pq.ParquetWriter(path, table.schema, compression="zstd")
+            else:
+                table = pa.Table.from_pandas(chunk, schema=writer.schema, preserve_index=False)
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def write_chunks(chunks, path, fmt):
+    """
+    Write DataFrame chunks to path, one chunk in memory at a time.
+    """
+    if fmt == "csv.gz":
+        with gzip.open(path, "wb", compresslevel=6) as raw:
+            _write_csv(chunks, raw)
+    elif fmt == "csv.zst":
+        if zstandard is None:
+            raise ValueError("zstd export needs the 'zstandard' package")
+        with open(path, "wb") as f, zstandard.ZstdCompressor(level=3).stream_writer(f) as raw:
+            _write_csv(chunks, raw)
+    elif fmt == "parquet":
+        _write_parquet(chunks, path)
+    else:
+        raise ValueError(f"Unsupported export format: {fmt}")
+
+
+def cleanup_exports(keep=None):
+    """
+    Remove exports unused for EXPORT_MAX_AGE_SECONDS, then the least
+    recently used ones until EXPORT_DIR holds at most EXPORT_DIR_MAX_MB.
+    Leftover temp files age out the same way. `keep` is never removed.
+    """
+    now = time.time()
+    entries = []
+    total = 0
+
+    try:
+        for entry in os.scandir(EXPORT_DIR):
+            if not entry.name.startswith("cleaned-") or entry.path == keep:
+                continue
+            stat = entry.stat()
+            if now - stat.st_mtime > EXPORT_MAX_AGE_SECONDS:
+                try:
+                    os.remove(entry.path)
+                except OSError:
+                    pass
+            elif not entry.name.endswith(".tmp"):
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total += stat.st_size
+        if keep and os.path.exists(keep):
+            total += os.path.getsize(keep)
+    except OSError:
+        return
+
+    for _, size, path in sorted(entries):
+        if total <= EXPORT_DIR_MAX_MB * 1024 * 1024:
+            break
+        try:
+            os.remove(path)
+            total -= size
+        except OSError:
+            pass
+
+
+def _strategies(plan):
+    if plan is None:
+        return None
+    return {entry["column"]: entry["strategy"] for entry in plan["columns"]}
+
+
+def find_export(fingerprint, fmt="csv.gz", plan=None):
+    """
+    Path of an already produced export, or None.
+    """
+    if fingerprint is None:
+        return None
+    path = export_path(fingerprint, _strategies(plan), fmt)
+    try:
+        os.utime(path)  # mark as recently used
+    except OSError:
+        return None
+    return path
+
+
+def export_cleaned(df, fingerprint, fmt="csv.gz", plan=None, chunk_rows=EXPORT_CHUNK_ROWS):
+    """
+    Clean df with CleaningPipeline and stream it to a compressed file.
+    The file is reused for the same fingerprint, cleaning plan and format
+    (never reused without a fingerprint). Returns the file path.
+    """
+    strategies = _strategies(plan)
+    path = export_path(fingerprint, strategies, fmt)
+
+    with _export_lock:
+        if fingerprint is not None and os.path.exists(path):
+            os.utime(path)
+            return path
+
+        os.makedirs(EXPORT_DIR, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+
+        try:
+            pipeline = CleaningPipeline(strategies).fit(df)
+            write_chunks(pipeline.transform_chunks(df, chunk_rows), tmp_path, fmt)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+        cleanup_exports(keep=path)
+
+    return path
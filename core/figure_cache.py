@@ -0,0 +1,129 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+import matplotlib
+import seaborn as sns
+
+from utils.constants import CACHE_DIR
+
+# ===============================
+# RENDERED FIGURE (PNG) CACHE
+# ===============================
+FIGURE_CACHE_DIR = os.path.join(CACHE_DIR, "figures")
+MEMORY_CACHE_ENTRIES = 64
+DISK_CACHE_MAX_MB = 256
+# bump whenever plotting code changes what a plot looks like: older PNGs
+# on disk then stop matching (library versions are part of the key too)
+FIGURE_CACHE_VERSION = 2
+
+
+class FigureCache:
+    """
+    Two-tier cache of rendered PNG bytes.
+    In-memory LRU in front of an on-disk directory with a size cap
+    (least recently used files are removed first).
+    """
+
+    def __init__(self, directory, memory_entries=MEMORY_CACHE_ENTRIES, disk_max_mb=DISK_CACHE_MAX_MB):
+        self.directory = directory
+        self.memory_entries = memory_entries
+        self.disk_max_bytes = disk_max_mb * 1024 * 1024
+        self.hits = 0
+        self.misses = 0
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(fingerprint, plot_type, features, size, dpi):
+        payload = json.dumps(
+            [FIGURE_CACHE_VERSION, matplotlib.__version__, sns.__version__,
+             fingerprint, plot_type, list(features), size, dpi],
+            default=str
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.png")
+
+    def _remember(self, key, png):
+        self._memory[key] = png
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, key):
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return self._memory[key]
+
+            path = self._path(key)
+            try:
+                with open(path, "rb") as f:
+                    png = f.read()
+                os.utime(path)  # mark as recently used
+            except OSError:
+                self.misses += 1
+                return None
+
+            self._remember(key, png)
+            self.hits += 1
+            return png
+
+    def set(self, key, png):
+        with self._lock:
+            self._remember(key, png)
+
+            try:
+                os.makedirs(self.directory, exist_ok=True)
+                tmp_path = f"{self._path(key)}.{os.getpid()}.tmp"
+                with open(tmp_path, "wb") as f:
+                    f.write(png)
+                os.replace(tmp_path, self._path(key))
+                self._enforce_disk_cap()
+            except OSError:
+                pass  # disk tier is best effort
+
+    def _enforce_disk_cap(self):
+        entries = []
+        total = 0
+
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".png"):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total += stat.st_size
+
+        for _, size, path in sorted(entries):
+            if total <= self.disk_max_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+
+    def get_or_render(self, key, render):
+        """
+        Cached PNG bytes for key; render() -> bytes is called only on a miss.
+        """
+        png = self.get(key)
+        if png is None:
+            png = render()
+            self.set(key, png)
+        return png
+
+    def stats(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "memory_entries": len(self._memory),
+            }
+
+
+figure_cache = FigureCache(FIGURE_CACHE_DIR)
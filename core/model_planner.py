@@ -1,11 +1,8 @@
-from llm_engine.llm_client import call_llm
+from llm_engine.llm_client import call_llm, submit_llm
 
 
-def _llm_model_planning_reasoning(problem_info):
-    """
-    LLM-assisted advisory reasoning for model planning.
-    """
-    prompt = f"""
+def _model_planning_prompt(problem_info):
+    return f"""
 You are a senior ML engineer.
 
 Context:
@@ -23,7 +20,21 @@ Rules:
 - Keep it concise
 - Plain text only
 """
-    return call_llm(prompt=prompt)
+
+
+def _llm_model_planning_reasoning(problem_info):
+    """
+    LLM-assisted advisory reasoning for model planning.
+    """
+    return call_llm(prompt=_model_planning_prompt(problem_info), site="model_planning")
+
+
+def submit_model_planning_reasoning(problem_info):
+    """
+    Start the advisory LLM call in the background.
+    Pass future.result() to plan_models(llm_reasoning=...).
+    """
+    return submit_llm(_model_planning_prompt(problem_info), site="model_planning")
 
 
 def plan_models(problem_info, llm_reasoning=None):
@@ -0,0 +1,94 @@
+import math
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from core.cleaning_guide import get_cleaning_guidance, submit_cleaning_guidance
+from core.data_loader import get_basic_info
+from core.data_profiler import detect_time_series, profile_dataset
+from core.model_planner import plan_models, submit_model_planning_reasoning
+from core.train_test_guide import get_train_test_guidance, submit_train_test_reasoning
+from llm_engine.llm_client import submit_llm
+from llm_engine.prompts import problem_understanding_prompt
+from llm_engine.response_parser import parse_llm_response
+
+# ===============================
+# HEADLESS MENTOR PIPELINE
+# The app's analysis stages without Streamlit (batch CLI, HTTP API).
+# ===============================
+_pipeline_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="pipeline")
+
+
+def to_jsonable(value):
+    """
+    DataFrames, NumPy scalars / arrays and NaN -> plain JSON values.
+    """
+    if isinstance(value, pd.DataFrame):
+        return to_jsonable(value.to_dict(orient="records"))
+    if isinstance(value, dict):
+        return {str(k): to_jsonable(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_jsonable(v) for v in value]
+    if isinstance(value, np.ndarray):
+        return to_jsonable(value.tolist())
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return str(value)
+
+
+def understand_problem(df, goal=""):
+    info = get_basic_info(df)
+    raw = submit_llm(
+        problem_understanding_prompt(goal, info),
+        fallback_context=goal,
+        site="problem_understanding"
+    ).result()
+    return info, parse_llm_response(raw)
+
+
+def cleaning_report(df):
+    return get_cleaning_guidance(df, llm_text=submit_cleaning_guidance(df).result())
+
+
+def plan_project(df, goal=""):
+    """
+    Problem understanding, then train/test guidance and model plans
+    (their two LLM calls run concurrently).
+    """
+    info, problem_info = understand_problem(df, goal)
+
+    task_type = problem_info["task_type"]
+    is_ts = task_type == "time_series"
+    train_test_future = submit_train_test_reasoning(task_type, is_ts)
+    models_future = submit_model_planning_reasoning(problem_info)
+
+    return {
+        "basic_info": info,
+        "problem_info": problem_info,
+        "train_test_guidance": get_train_test_guidance(
+            task_type, is_ts, llm_reasoning=train_test_future.result()
+        ),
+        "model_plans": plan_models(problem_info, llm_reasoning=models_future.result()),
+    }
+
+
+def analyze_dataframe(df, goal=""):
+    """
+    Full mentor report for one dataset, as a JSON-ready dict.
+    LLM calls run concurrently with the CPU-bound profiling.
+    """
+    cleaning_future = submit_cleaning_guidance(df)
+    plans_future = _pipeline_executor.submit(plan_project, df, goal)
+
+    report = {
+        "health_report": profile_dataset(df),
+        "time_series": detect_time_series(df),
+        "cleaning_guidance": get_cleaning_guidance(df, llm_text=cleaning_future.result()),
+    }
+    report.update(plans_future.result())
+    return to_jsonable(report)
@@ -0,0 +1,132 @@
+import math
+
+import numpy as np
+import pandas as pd
+
+# ===============================
+# MERGEABLE SKETCHES
+# One pass over chunks, bounded memory, mergeable across chunks/workers.
+# ===============================
+
+
+def _hash_values(values):
+    """
+    64-bit hashes of a Series' non-null values.
+    Numbers are hashed as float64 so int / float chunks of one column agree.
+    """
+    values = values.dropna()
+    if pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+        values = values.astype("float64")
+    return pd.util.hash_pandas_object(values, index=False).to_numpy(dtype=np.uint64)
+
+
+def _bit_length(values):
+    """
+    Exact bit length of uint64 values.
+    Each 32-bit half is exact in float64, so frexp's exponent is exact.
+    """
+    high = np.frexp((values >> np.uint64(32)).astype(np.float64))[1]
+    low = np.frexp((values & np.uint64(0xFFFFFFFF)).astype(np.float64))[1]
+    return np.where(high > 0, high + 32, low).astype(np.int64)
+
+
+class HyperLogLog:
+    """
+    Distinct-count sketch. Relative standard error ~ 1.04 / sqrt(2 ** precision).
+    """
+
+    def __init__(self, precision=14):
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    def add(self, values):
+        hashes = _hash_values(values)
+        if hashes.size == 0:
+            return self
+
+        p = np.uint64(self.precision)
+        index = (hashes >> (np.uint64(64) - p)).astype(np.int64)
+        remainder = hashes << p
+        # position of the leftmost 1-bit in the remaining 64 - p bits
+        rank = ((64 - self.precision + 1) - _bit_length(remainder >> p)).astype(np.uint8)
+
+        np.maximum.at(self.registers, index, rank)
+        return self
+
+    def merge(self, other):
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    @property
+    def relative_error(self):
+        return 1.04 / math.sqrt(len(self.registers))
+
+    def estimate(self):
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / np.sum(np.power(2.0, -self.registers.astype(np.float64)))
+
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if raw <= 2.5 * m and zeros:
+            # small-range correction (linear counting)
+            return m * math.log(m / zeros)
+        return raw
+
+
+class QuantileSketch:
+    """
+    Uniform bottom-k sample of the values (mergeable).
+    With k values kept, every estimated rank is within
+    rank_error(confidence) of the truth (DKW inequality).
+    """
+
+    def __init__(self, size=4096, seed=None):
+        self.size = size
+        self.rng = np.random.default_rng(seed)
+        self.values = np.empty(0, dtype=np.float64)
+        self.priorities = np.empty(0, dtype=np.float64)
+        self.count = 0
+
+    def _keep_smallest(self, values, priorities):
+        if len(values) > self.size:
+            keep = np.argpartition(priorities, self.size - 1)[:self.size]
+            values, priorities = values[keep], priorities[keep]
+        self.values, self.priorities = values, priorities
+
+    def add(self, values):
+        values = pd.to_numeric(values, errors="coerce").dropna().to_numpy(dtype=np.float64)
+        self.count += len(values)
+        priorities = self.rng.random(len(values))
+
+        self._keep_smallest(
+            np.concatenate([self.values, values]),
+            np.concatenate([self.priorities, priorities])
+        )
+        return self
+
+    def merge(self, other):
+        self.count += other.count
+        self._keep_smallest(
+            np.concatenate([self.values, other.values]),
+            np.concatenate([self.priorities, other.priorities])
+        )
+        return self
+
+    @property
+    def exact(self):
+        return self.count <= self.size
+
+    def rank_error(self, confidence=0.95):
+        if self.exact or not len(self.values):
+            return 0.0
+        return math.sqrt(math.log(2 / (1 - confidence)) / (2 * len(self.values)))
+
+    def quantile(self, q):
+        if not len(self.values):
+            return np.nan
+        return float(np.quantile(self.values, q))
+
+    def fraction_outside(self, lower, upper):
+        if not len(self.values):
+            return 0.0
+        return float(np.mean((self.values < lower) | (self.values > upper)))
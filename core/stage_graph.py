@@ -0,0 +1,65 @@
+import hashlib
+import json
+import time
+
+# ===============================
+# INCREMENTAL STAGE GRAPH
+# Each analysis stage declares its inputs; a stage is recomputed only
+# when its inputs (or an upstream stage's result) changed.
+# ===============================
+
+
+def _input_key(inputs):
+    payload = json.dumps(inputs, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class StageGraph:
+    """
+    Memoized stages on top of a dict-like store (e.g. st.session_state).
+
+    graph.run("profile", compute, fingerprint=fp) returns the memoized
+    result while `fingerprint` is unchanged. Passing graph.version("x")
+    as an input makes a stage depend on stage "x": whenever "x" is
+    recomputed with new inputs, its dependents are recomputed too.
+
+    graph.trace lists (stage, "ran" | "memo", seconds) for this run.
+    """
+
+    def __init__(self, store, memo_key="stage_memo"):
+        if memo_key not in store:
+            store[memo_key] = {}
+        self._memo = store[memo_key]
+        self.trace = []
+
+    def version(self, name):
+        """
+        Input key of the stage's memoized result (None if it never ran).
+        """
+        entry = self._memo.get(name)
+        return entry[0] if entry else None
+
+    def needs_run(self, name, **inputs):
+        entry = self._memo.get(name)
+        return entry is None or entry[0] != _input_key(inputs)
+
+    def run(self, name, compute, **inputs):
+        key = _input_key(inputs)
+        entry = self._memo.get(name)
+
+        if entry is not None and entry[0] == key:
+            self.trace.append((name, "memo", 0.0))
+            return entry[1]
+
+        start = time.perf_counter()
+        value = compute()
+        self.trace.append((name, "ran", time.perf_counter() - start))
+
+        self._memo[name] = (key, value)
+        return value
+
+    def invalidate(self, name=None):
+        if name is None:
+            self._memo.clear()
+        else:
+            self._memo.pop(name, None)
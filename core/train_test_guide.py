@@ -1,12 +1,8 @@
-from llm_engine.llm_client import call_llm
+from llm_engine.llm_client import call_llm, submit_llm
 
 
-def _llm_train_test_reasoning(task_type, is_time_series):
-    """
-    LLM-assisted advisory reasoning only.
-    Safe, low-token, optional.
-    """
-    prompt = f"""
+def _train_test_prompt(task_type, is_time_series):
+    return f"""
 You are a senior ML engineer.
 
 Context:
@@ -23,10 +19,25 @@ Rules:
 - Max 4 bullet points
 - Plain text only
 """
-    return call_llm(prompt=prompt)
 
 
-def get_train_test_guidance(task_type, is_time_series=False):
+def _llm_train_test_reasoning(task_type, is_time_series):
+    """
+    LLM-assisted advisory reasoning only.
+    Safe, low-token, optional.
+    """
+    return call_llm(prompt=_train_test_prompt(task_type, is_time_series), site="train_test")
+
+
+def submit_train_test_reasoning(task_type, is_time_series=False):
+    """
+    Start the advisory LLM call in the background.
+    Pass future.result() to get_train_test_guidance(llm_reasoning=...).
+    """
+    return submit_llm(_train_test_prompt(task_type, is_time_series), site="train_test")
+
+
+def get_train_test_guidance(task_type, is_time_series=False, llm_reasoning=None):
     """
     Returns structured guidance for choosing train-test split strategy.
     Teaching + planning only (no training).
@@ -38,7 +49,11 @@ def get_train_test_guidance(task_type, is_time_series=False):
     # TIME SERIES SPLIT (PRIORITY)
     # ===============================
     if is_time_series:
-        llm_reason = _llm_train_test_reasoning(task_type, is_time_series)
+        llm_reason = (
+            llm_reasoning
+            if llm_reasoning is not None
+            else _llm_train_test_reasoning(task_type, is_time_series)
+        )
 
         guidance.append({
             "title": "Time Series Train-Test Split",
@@ -68,7 +83,11 @@ test_df  = df.iloc[split_index:]
     # ===============================
     # RANDOM SPLIT (NOW LLM-AWARE)
     # ===============================
-    llm_reason = _llm_train_test_reasoning(task_type, is_time_series)
+    llm_reason = (
+        llm_reasoning
+        if llm_reasoning is not None
+        else _llm_train_test_reasoning(task_type, is_time_series)
+    )
 
     guidance.append({
         "title": "Random Train-Test Split",
@@ -95,7 +114,11 @@ X_train, X_test, y_train, y_test = train_test_split(
     # STRATIFIED SPLIT (CLASSIFICATION)
     # ===============================
     if task_type == "classification":
-        llm_reason = _llm_train_test_reasoning(task_type, is_time_series)
+        llm_reason = (
+            llm_reasoning
+            if llm_reasoning is not None
+            else _llm_train_test_reasoning(task_type, is_time_series)
+        )
 
         guidance.append({
             "title": "Stratified Train-Test Split",
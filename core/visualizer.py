@@ -1,27 +1,32 @@
+from functools import partial
+
 import matplotlib.pyplot as plt
 import seaborn as sns
 import pandas as pd
 
-from llm_engine.llm_client import call_llm
+from core.aggregate_plots import draw_boxplot_from_stats
+from core.correlation import (
+    ANNOTATE_MAX_COLUMNS,
+    correlation_matrix,
+    heatmap_view,
+    top_correlated_pairs,
+)
+from core.data_profiler import column_box_stats
+from llm_engine.llm_client import call_llm, stream_llm
 
 
 def get_numeric_columns(df):
-    return df.select_dtypes(include=["int64", "float64"]).columns.tolist()
+    return df.select_dtypes(include="number").columns.tolist()
 
 
 # ===============================
 # LLM advisory (prioritization + explanation)
 # ===============================
-def get_visualization_advice(df, target_col=None, max_cols=8, session_state=None):
-    """
-    LLM-assisted visualization prioritization.
-    Advisory only. No plotting, no execution.
-    """
-    try:
-        cols = df.columns.tolist()[:max_cols]
-        dtypes = {c: str(df[c].dtype) for c in cols}
+def _visualization_advice_prompt(df, target_col=None, max_cols=8):
+    cols = df.columns.tolist()[:max_cols]
+    dtypes = {c: str(df[c].dtype) for c in cols}
 
-        prompt = f"""
+    return f"""
 You are a senior data scientist.
 
 Dataset summary:
@@ -40,16 +45,31 @@ Rules:
 - Plain text only
 """
 
+
+def get_visualization_advice(df, target_col=None, max_cols=8, session_state=None):
+    """
+    LLM-assisted visualization prioritization.
+    Advisory only. No plotting, no execution.
+    """
+    try:
         return call_llm(
-            prompt=prompt,
+            prompt=_visualization_advice_prompt(df, target_col, max_cols),
             cache_key="viz_advice",
-            session_state=session_state
+            session_state=session_state,
+            site="viz_advice"
         )
 
     except Exception:
         return None
 
 
+def stream_visualization_advice(df, target_col=None, max_cols=8):
+    """
+    Streaming variant of get_visualization_advice (yields text chunks).
+    """
+    return stream_llm(_visualization_advice_prompt(df, target_col, max_cols), site="viz_advice")
+
+
 # ===============================
 # RULE-BASED PLOTS (UNCHANGED)
 # ===============================
@@ -60,26 +80,140 @@ def plot_target_distribution(df, target_col):
     return fig
 
 
-def plot_correlation_heatmap(df):
-    numeric_df = df.select_dtypes(include=["int64", "float64"])
-    if numeric_df.shape[1] < 2:
+def draw_correlation_heatmap(ax, corr):
+    """
+    Capped, cluster-ordered heatmap; cells are annotated only
+    when the matrix is small enough to read them.
+    """
+    view = heatmap_view(corr)
+    sns.heatmap(
+        view,
+        annot=len(view) <= ANNOTATE_MAX_COLUMNS,
+        fmt=".2f",
+        cmap="coolwarm",
+        vmin=-1,
+        vmax=1,
+        xticklabels=True,
+        yticklabels=True,
+        ax=ax
+    )
+    if len(view) < len(corr):
+        ax.set_xlabel(f"{len(view)} of {len(corr)} numeric columns (strongest correlations)")
+
+
+def plot_correlation_heatmap(df, fingerprint=None):
+    corr = correlation_matrix(df, fingerprint)
+    if corr.shape[1] < 2:
         return None
 
     fig, ax = plt.subplots(figsize=(8, 6))
-    corr = numeric_df.corr()
-    sns.heatmap(corr, annot=True, cmap="coolwarm", ax=ax)
+    draw_correlation_heatmap(ax, corr)
     ax.set_title("Correlation Heatmap")
     return fig
 
 
-def plot_boxplots(df):
-    numeric_cols = get_numeric_columns(df)
-    figures = []
+def plot_top_correlations(df, fingerprint=None):
+    pairs = top_correlated_pairs(correlation_matrix(df, fingerprint))
+    if pairs.empty:
+        return None
+
+    labels = [f"{a} ~ {b}" for a, b in zip(pairs["feature_1"], pairs["feature_2"])]
+    colors = ["#c44e52" if r > 0 else "#4c72b0" for r in pairs["correlation"]]
+
+    fig, ax = plt.subplots(figsize=(8, max(3, 0.3 * len(pairs))))
+    ax.barh(labels[::-1], pairs["correlation"].to_numpy()[::-1], color=colors[::-1])
+    ax.set_xlim(-1, 1)
+    ax.axvline(0, color="black", linewidth=0.8)
+    ax.set_xlabel("correlation")
+    ax.set_title("Strongest Correlated Pairs")
+    return fig
 
-    for col in numeric_cols:
-        fig, ax = plt.subplots()
+
+def plot_boxplot(df, col):
+    """
+    Drawn from the quartiles / whiskers computed by the health report,
+    not from the raw rows.
+    """
+    fig, ax = plt.subplots()
+    stats = column_box_stats(df, col)
+    if stats is not None and stats["count"]:
+        draw_boxplot_from_stats(ax, stats, col)
+    else:
         sns.boxplot(x=df[col], ax=ax)
-        ax.set_title(f"Distribution & Outlier Check: {col}")
-        figures.append(fig)
+    ax.set_title(f"Distribution & Outlier Check: {col}")
+    return fig
+
+
+def plot_boxplots(df):
+    return [plot_boxplot(df, col) for col in get_numeric_columns(df)]
+
+
+# ===============================
+# LAZY VISUALIZATION COLLECTION
+# ===============================
+class LazyVisualizations:
+    """
+    Indexable collection of the automatic visualizations.
+    Length, titles and descriptions are known without drawing;
+    a figure is built only when it is requested.
+    """
 
-    return figures
+    def __init__(self, df, fingerprint=None):
+        self.df = df
+        self._specs = []
+
+        numeric_cols = get_numeric_columns(df)
+
+        if len(numeric_cols) >= 2:
+            self._specs.append((
+                "Correlation Heatmap",
+                "sns.heatmap(df.corr())",
+                "numeric feature correlations",
+                partial(plot_correlation_heatmap, fingerprint=fingerprint),
+                (),
+            ))
+            self._specs.append((
+                "Strongest Correlated Pairs",
+                "top_correlated_pairs(df.corr())",
+                "most correlated numeric feature pairs",
+                partial(plot_top_correlations, fingerprint=fingerprint),
+                (),
+            ))
+
+        for col in numeric_cols:
+            self._specs.append((
+                "Boxplot",
+                "sns.boxplot(x=df[column])",
+                "single numeric feature",
+                plot_boxplot,
+                (col,),
+            ))
+
+    def __len__(self):
+        return len(self._specs)
+
+    @property
+    def titles(self):
+        return [self.title(i) for i in range(len(self))]
+
+    def title(self, idx):
+        title, _, _, _, args = self._specs[idx]
+        return f"{title}: {args[0]}" if args else title
+
+    def describe(self, idx):
+        """
+        (title, code, feature_context) without drawing anything.
+        """
+        title, code, feature_context, _, _ = self._specs[idx]
+        return title, code, feature_context
+
+    def figure(self, idx):
+        _, _, _, builder, args = self._specs[idx]
+        return builder(self.df, *args)
+
+    def __getitem__(self, idx):
+        return (*self.describe(idx), self.figure(idx))
+
+
+def get_visualizations(df, fingerprint=None):
+    return LazyVisualizations(df, fingerprint)
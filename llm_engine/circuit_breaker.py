@@ -0,0 +1,154 @@
+import random
+import threading
+import time
+
+import openai
+
+# ===============================
+# CIRCUIT BREAKER & RETRIES FOR THE LLM PROVIDER
+# After FAILURE_THRESHOLD consecutive transient failures the circuit opens
+# and calls go straight to the fallback; after COOLDOWN_SECONDS one probe
+# request is let through (half-open) to detect recovery.
+# ===============================
+FAILURE_THRESHOLD = 5
+COOLDOWN_SECONDS = 30
+
+MAX_RETRIES = 2                    # extra attempts per call, transient errors only
+RETRY_BASE_DELAY = 0.5             # seconds; full jitter on an exponential backoff
+RETRY_MAX_DELAY = 4.0
+RETRY_BUDGET_SECONDS = 12          # all attempts of one call, from its first admission
+RETRY_MIN_ATTEMPT_SECONDS = 1.0    # no retry with less time than this left
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+TRANSIENT_ERRORS = (
+    openai.error.Timeout,
+    openai.error.RateLimitError,
+    openai.error.APIConnectionError,
+    openai.error.ServiceUnavailableError,
+    openai.error.TryAgain,
+)
+
+
+def is_transient(exc):
+    """
+    Errors worth retrying: timeouts, rate limits, connection and 5xx errors.
+    """
+    if isinstance(exc, TRANSIENT_ERRORS):
+        return True
+    return isinstance(exc, openai.error.APIError) and (exc.http_status or 500) >= 500
+
+
+def retry_delay(exc, attempt):
+    """
+    Seconds to wait before retry number `attempt` (0-based).
+    Uses the provider's Retry-After for rate limits when it sends one.
+    """
+    if isinstance(exc, openai.error.RateLimitError):
+        retry_after = (exc.headers or {}).get("retry-after")
+        try:
+            return min(float(retry_after), RETRY_MAX_DELAY)
+        except (TypeError, ValueError):
+            pass
+    return random.uniform(0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** attempt))
+
+
+class CircuitOpen(Exception):
+    """
+    The provider is considered down; the call was not attempted.
+    """
+
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold=FAILURE_THRESHOLD, cooldown_seconds=COOLDOWN_SECONDS):
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0                 # consecutive transient failures
+        self._opened_at = None
+        self._probe_started = None         # time the half-open probe was let through
+        self._counts = {"opened": 0, "short_circuited": 0, "probes": 0}
+
+    @property
+    def state(self):
+        with self._lock:
+            return self._state
+
+    def allow(self):
+        """
+        Whether a call may go to the provider now.
+        """
+        with self._lock:
+            now = time.monotonic()
+
+            if self._state == OPEN and now - self._opened_at >= self.cooldown_seconds:
+                self._state = HALF_OPEN
+                self._probe_started = None
+
+            if self._state == CLOSED:
+                return True
+
+            # one probe at a time; a probe that never reported back expires
+            if self._state == HALF_OPEN and (
+                self._probe_started is None
+                or now - self._probe_started >= self.cooldown_seconds
+            ):
+                self._probe_started = now
+                self._counts["probes"] += 1
+                return True
+
+            self._counts["short_circuited"] += 1
+            return False
+
+    def record_success(self):
+        """
+        The provider answered (even with a non-transient error).
+        """
+        with self._lock:
+            self._state = CLOSED
+            self._failures = 0
+            self._probe_started = None
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != OPEN:
+                    self._counts["opened"] += 1
+                self._state = OPEN
+                self._opened_at = time.monotonic()
+                self._probe_started = None
+
+    def release(self):
+        """
+        A call let through was not sent after all (e.g. the scheduler refused it).
+        """
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._probe_started = None
+
+    def snapshot(self):
+        with self._lock:
+            retry_in = None
+            if self._state == OPEN:
+                retry_in = max(0.0, self.cooldown_seconds - (time.monotonic() - self._opened_at))
+            return dict(
+                self._counts,
+                state=self._state,
+                consecutive_failures=self._failures,
+                retry_in_seconds=round(retry_in, 1) if retry_in is not None else None,
+            )
+
+    def reset(self):
+        with self._lock:
+            self._state = CLOSED
+            self._failures = 0
+            self._opened_at = None
+            self._probe_started = None
+
+
+breaker = CircuitBreaker()
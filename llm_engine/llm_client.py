@@ -1,9 +1,39 @@
+import contextvars
+import logging
 import os
+import threading
+import time
+from concurrent.futures import Future
+
 import openai
 from dotenv import load_dotenv
 
+from llm_engine.circuit_breaker import (
+    MAX_RETRIES,
+    OPEN,
+    RETRY_BUDGET_SECONDS,
+    RETRY_MIN_ATTEMPT_SECONDS,
+    CircuitOpen,
+    breaker,
+    is_transient,
+    retry_delay,
+)
+from llm_engine.recorder import ResponseRecorder
+from llm_engine.response_cache import ResponseCache
+from llm_engine.scheduler import (
+    PriorityExecutor,
+    SchedulerRejected,
+    current_session,
+    priority_for,
+    scheduler,
+)
+from llm_engine.telemetry import estimate_tokens, telemetry
+from utils.constants import CACHE_DIR
+
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 # -------------------------------
 # LLM SAFETY & COST CONTROLS
 # -------------------------------
@@ -11,57 +41,280 @@ MODEL_NAME = "gpt-3.5-turbo"
 MAX_TOKENS = 1200          # hard cap to control cost
 TEMPERATURE = 0.2
 REQUEST_TIMEOUT = 10     # seconds
+SYSTEM_MESSAGE = "You are a careful ML mentor. Be concise and practical."
+DEFAULT_SITE = "unspecified"     # telemetry label when the caller gives none
+CIRCUIT_GAUGE = {"closed": 0, "half_open": 0.5, "open": 1}
+
+# -------------------------------
+# PERSISTENT RESPONSE CACHE (PROCESS-WIDE)
+# -------------------------------
+CACHE_PATH = os.getenv(
+    "LLM_CACHE_PATH",
+    os.path.join(CACHE_DIR, "llm_responses.sqlite3")
+)
+CACHE_MAX_ENTRIES = 2000
+CACHE_TTL_SECONDS = 7 * 24 * 3600
 
+_response_cache = ResponseCache(
+    CACHE_PATH,
+    max_entries=CACHE_MAX_ENTRIES,
+    ttl_seconds=CACHE_TTL_SECONDS
+)
 
-def call_llm(prompt, fallback_context=None, cache_key=None, session_state=None):
-    
+# -------------------------------
+# RECORDING (FOR OFFLINE REPLAY, SEE llm_engine/stub_server.py)
+# -------------------------------
+RECORD_PATH = os.getenv("LLM_RECORD_PATH")
+
+_recorder = ResponseRecorder(RECORD_PATH) if RECORD_PATH else None
+
+
+# -------------------------------
+# CONCURRENT EXECUTION (SHARED POOL, BY CALL-SITE PRIORITY)
+# -------------------------------
+MAX_CONCURRENT_CALLS = 8
+
+_llm_executor = PriorityExecutor(
+    max_workers=MAX_CONCURRENT_CALLS,
+    thread_name_prefix="llm"
+)
+
+
+# -------------------------------
+# SINGLE-FLIGHT (IN-FLIGHT DEDUPLICATION)
+# -------------------------------
+_inflight = {}
+_inflight_lock = threading.Lock()
+_singleflight_counts = {"upstream": 0, "deduplicated": 0}
+
+
+def get_cache_stats():
     """
-    Tries OpenAI first (if API key exists).
-    Enforces token limits & safe defaults.
-    If API fails → returns rule-based safe response.
+    Hit / miss counters and size of the persistent response cache.
     """
+    return _response_cache.stats()
 
-    # -------------------------------
-    # OPTIONAL CACHE (PER SESSION)
-    # -------------------------------
-    if cache_key and session_state is not None:
-        if cache_key in session_state:
-            return session_state[cache_key]
 
-    api_key = os.getenv("OPENAI_API_KEY")
+def get_singleflight_stats():
+    """
+    Upstream requests made vs. callers that joined an identical in-flight one.
+    """
+    with _inflight_lock:
+        return dict(_singleflight_counts, in_flight=len(_inflight))
+
+
+def _single_flight(key, fetch):
+    """
+    Run fetch() once per key at a time.
+    Concurrent callers with the same key wait for and share that result
+    (or its exception), across sessions in this server process.
+    A session budget rejection belongs to the leader's session only:
+    followers then run fetch() themselves.
+    Returns (result, shared): shared is True for callers that joined.
+    """
+    while True:
+        with _inflight_lock:
+            future = _inflight.get(key)
+            leader = future is None
+
+            if leader:
+                future = Future()
+                _inflight[key] = future
+                _singleflight_counts["upstream"] += 1
+            else:
+                _singleflight_counts["deduplicated"] += 1
+
+        if leader:
+            break
 
-    if api_key:
-        
         try:
-            print("✅ OPENAI API USED")
-            openai.api_key = api_key
+            return future.result(), True
+        except SchedulerRejected as exc:
+            if exc.reason != "session_budget":
+                raise
+
+    try:
+        result = fetch()
+        future.set_result(result)
+        return result, False
+    except BaseException as exc:
+        future.set_exception(exc)
+        raise
+    finally:
+        with _inflight_lock:
+            _inflight.pop(key, None)
+
+
+def _chat_messages(prompt):
+    return [
+        {"role": "system", "content": SYSTEM_MESSAGE},
+        {"role": "user", "content": prompt}
+    ]
+
+
+def get_scheduler_stats():
+    """
+    Admissions, waits and rejections of the rate limiter / priority scheduler.
+    """
+    return scheduler.stats()
+
+
+def get_breaker_state():
+    """
+    Circuit breaker state (closed / open / half_open) and its counters.
+    """
+    return breaker.snapshot()
+
+
+def get_llm_metrics():
+    """
+    Per-call-site summary rows (latency, tokens, cache, errors, fallbacks).
+    """
+    return telemetry.snapshot()
+
+
+def export_llm_metrics():
+    """
+    LLM telemetry plus cache / single-flight counters, Prometheus text format.
+    """
+    cache = get_cache_stats()
+    flight = get_singleflight_stats()
+    sched = get_scheduler_stats()
+    circuit = get_breaker_state()
+    lines = [
+        "# HELP llm_response_cache_entries Entries in the persistent response cache.",
+        "# TYPE llm_response_cache_entries gauge",
+        f"llm_response_cache_entries {cache.get('entries') or 0}",
+        "# HELP llm_singleflight_total Upstream requests vs. callers that joined one in flight.",
+        "# TYPE llm_singleflight_total counter",
+        f'llm_singleflight_total{{role="upstream"}} {flight["upstream"]}',
+        f'llm_singleflight_total{{role="deduplicated"}} {flight["deduplicated"]}',
+        "# HELP llm_scheduler_requests_total Upstream requests admitted or rejected by the scheduler.",
+        "# TYPE llm_scheduler_requests_total counter",
+        f'llm_scheduler_requests_total{{result="admitted"}} {sched["admitted"]}',
+        f'llm_scheduler_requests_total{{result="rejected_budget"}} {sched["rejected_budget"]}',
+        f'llm_scheduler_requests_total{{result="rejected_timeout"}} {sched["rejected_timeout"]}',
+        "# HELP llm_scheduler_wait_seconds Time admitted requests waited for capacity.",
+        "# TYPE llm_scheduler_wait_seconds summary",
+        f"llm_scheduler_wait_seconds_sum {sched['wait_seconds_sum']:.6f}",
+        f"llm_scheduler_wait_seconds_count {sched['admitted']}",
+        "# HELP llm_scheduler_waiting Requests currently waiting for capacity.",
+        "# TYPE llm_scheduler_waiting gauge",
+        f"llm_scheduler_waiting {sched['waiting']}",
+        "# HELP llm_circuit_open Provider circuit breaker: 0 closed, 0.5 half-open, 1 open.",
+        "# TYPE llm_circuit_open gauge",
+        f"llm_circuit_open {CIRCUIT_GAUGE[circuit['state']]}",
+        "# HELP llm_circuit_events_total Circuit openings, short-circuited calls and recovery probes.",
+        "# TYPE llm_circuit_events_total counter",
+        f'llm_circuit_events_total{{event="opened"}} {circuit["opened"]}',
+        f'llm_circuit_events_total{{event="short_circuited"}} {circuit["short_circuited"]}',
+        f'llm_circuit_events_total{{event="probe"}} {circuit["probes"]}',
+    ]
+    return telemetry.to_prometheus() + "\n".join(lines) + "\n"
+
+
+def _estimated_request_tokens(prompt):
+    """
+    Tokens a request counts against the provider's limit before it runs:
+    the prompt estimate plus the completion cap.
+    """
+    return estimate_tokens(SYSTEM_MESSAGE + prompt) + MAX_TOKENS
+
+
+def _create_completion(prompt, site, session_id, stream=False):
+    """
+    ChatCompletion.create behind the circuit breaker and the scheduler,
+    retrying transient errors with jittered backoff. All attempts share
+    RETRY_BUDGET_SECONDS (each one's timeout is capped at what is left),
+    so one call stays within about that budget before falling back.
+    A stream's outcome is reported to the breaker by the caller once it ends.
+    """
+    deadline = None
+    attempt = 0
+    last_error = None
+
+    while True:
+        if not breaker.allow():
+            # opened by other calls while this one backed off: report its own error
+            if last_error is not None:
+                raise last_error
+            raise CircuitOpen("LLM provider circuit is open")
 
+        try:
+            scheduler.acquire(site, _estimated_request_tokens(prompt), session_id)
+        except SchedulerRejected:
+            breaker.release()
+            if last_error is not None:
+                telemetry.record_error(site, last_error)
+            raise
+
+        if deadline is None:
+            deadline = time.monotonic() + RETRY_BUDGET_SECONDS
+        attempt_timeout = min(REQUEST_TIMEOUT, max(deadline - time.monotonic(), RETRY_MIN_ATTEMPT_SECONDS))
+
+        logger.debug("LLM request to provider (site=%s, attempt=%d, stream=%s)", site, attempt + 1, stream)
+
+        try:
             response = openai.ChatCompletion.create(
                 model=MODEL_NAME,
-                messages=[
-                    {"role": "system", "content": "You are a careful ML mentor. Be concise and practical."},
-                    {"role": "user", "content": prompt}
-                ],
+                messages=_chat_messages(prompt),
                 temperature=TEMPERATURE,
                 max_tokens=MAX_TOKENS,
-                request_timeout=REQUEST_TIMEOUT
+                request_timeout=attempt_timeout,
+                stream=stream
             )
+        except Exception as exc:
+            if not is_transient(exc):
+                breaker.record_success()       # the provider answered; the request was bad
+                raise
 
-            content = response["choices"][0]["message"]["content"]
+            breaker.record_failure()
+            delay = retry_delay(exc, attempt)
+            left = deadline - time.monotonic() - delay
+            # a timed-out request needs a full attempt to be worth repeating
+            needed = REQUEST_TIMEOUT if isinstance(exc, openai.error.Timeout) else RETRY_MIN_ATTEMPT_SECONDS
 
-            # store in cache if provided
-            if cache_key and session_state is not None:
-                session_state[cache_key] = content
+            # this error (not CircuitOpen) is what the caller records
+            if attempt >= MAX_RETRIES or left < needed or breaker.state == OPEN:
+                raise
 
-            return content
+            telemetry.record_retry(site, exc)
+            last_error = exc
+            time.sleep(delay)
+            attempt += 1
+            continue
 
-        except Exception:
-            print("❌ OPENAI FAILED, FALLING BACK")
-            pass  # silently fall back (never crash app)
+        if not stream:
+            breaker.record_success()
+        return response
 
-    # ===============================
-    # FALLBACK (NO API REQUIRED)
-    # ===============================
+
+def _request_completion(api_key, prompt, cache_key=None, site=DEFAULT_SITE):
+    session_id = current_session.get()
+    openai.api_key = api_key
+    start = time.perf_counter()
+
+    response = _create_completion(prompt, site, session_id)
+
+    content = response["choices"][0]["message"]["content"]
+
+    usage = response.get("usage") or {}
+    telemetry.record_tokens(site, usage.get("prompt_tokens"), usage.get("completion_tokens"))
+    scheduler.charge(session_id, usage.get("total_tokens") or estimate_tokens(SYSTEM_MESSAGE + prompt + content))
+
+    if _recorder and cache_key:
+        _recorder.record(cache_key, prompt, content, time.perf_counter() - start, usage=usage)
+
+    if cache_key:
+        _response_cache.set(cache_key, content)
+
+    return content
+
+
+def _fallback_response(fallback_context):
+    """
+    Rule-based safe response used whenever the API is unavailable.
+    """
     goal = (fallback_context or "").lower()
 
     if "predict" in goal or "classification" in goal or "heart" in goal:
@@ -92,3 +345,197 @@ def call_llm(prompt, fallback_context=None, cache_key=None, session_state=None):
   "reasoning": "Fallback decision based on common supervised learning patterns."
 }
 """
+
+
+def call_llm(prompt, fallback_context=None, cache_key=None, session_state=None, site=DEFAULT_SITE):
+    
+    """
+    Tries OpenAI first (if API key exists).
+    Responses are cached on disk across sessions (TTL + LRU).
+    Enforces token limits & safe defaults.
+    If API fails → returns rule-based safe response.
+    Transient errors are retried; while the provider circuit is open
+    (llm_engine/circuit_breaker.py) the fallback is returned at once.
+    `site` labels the call in the telemetry (see llm_engine/telemetry.py).
+    """
+    start = time.perf_counter()
+
+    # -------------------------------
+    # OPTIONAL CACHE (PER SESSION)
+    # -------------------------------
+    if cache_key and session_state is not None:
+        if cache_key in session_state:
+            telemetry.record_cache(site, hit=True)
+            telemetry.record_call(site, "session_cache", time.perf_counter() - start)
+            return session_state[cache_key]
+
+    api_key = os.getenv("OPENAI_API_KEY")
+    fallback_reason = "no_api_key"
+
+    if api_key:
+        
+        try:
+            # -------------------------------
+            # PERSISTENT CACHE (CROSS-SESSION)
+            # -------------------------------
+            key = ResponseCache.make_key(MODEL_NAME, TEMPERATURE, SYSTEM_MESSAGE, prompt)
+            content = _response_cache.get(key)
+            telemetry.record_cache(site, hit=content is not None)
+            source = "cache"
+
+            if content is None:
+                # over budget: fall back before joining another session's request
+                scheduler.check_budget(current_session.get())
+
+                # identical prompts already in flight share one request
+                content, shared = _single_flight(
+                    key,
+                    lambda: _request_completion(api_key, prompt, cache_key=key, site=site)
+                )
+                # answered by another caller's request: not an upstream call of its own
+                source = "coalesced" if shared else "upstream"
+
+            # store in cache if provided
+            if cache_key and session_state is not None:
+                session_state[cache_key] = content
+
+            telemetry.record_call(site, source, time.perf_counter() - start)
+            return content
+
+        except SchedulerRejected as exc:
+            # rate limit / session budget: answer now instead of queueing
+            fallback_reason = exc.reason
+
+        except CircuitOpen:
+            # provider down: answer now instead of waiting for a timeout
+            fallback_reason = "circuit_open"
+
+        except Exception as exc:
+            logger.debug("LLM call failed, falling back (site=%s): %r", site, exc)
+            telemetry.record_error(site, exc)
+            fallback_reason = "error"
+            # silently fall back (never crash app)
+
+    # ===============================
+    # FALLBACK (NO API REQUIRED)
+    # ===============================
+    telemetry.record_fallback(site, fallback_reason)
+    telemetry.record_call(site, "fallback", time.perf_counter() - start)
+    return _fallback_response(fallback_context)
+
+# ===============================
+# CONCURRENT / BATCHED CALLS
+# ===============================
+def submit_llm(prompt, fallback_context=None, site=DEFAULT_SITE):
+    """
+    Schedule call_llm on the shared thread pool.
+    Returns a Future; call .result() when the text is needed.
+    Session-state caching is not available here (worker threads); the
+    caller's scheduler session (llm_engine/scheduler.py) is carried over.
+    """
+    context = contextvars.copy_context()
+    return _llm_executor.submit(priority_for(site), context.run, call_llm, prompt, fallback_context, site=site)
+
+
+def call_llm_many(prompts, fallback_contexts=None, site=DEFAULT_SITE):
+    """
+    Run several independent prompts concurrently.
+    Returns the responses in the same order as the prompts.
+    """
+    if fallback_contexts is None:
+        fallback_contexts = [None] * len(prompts)
+
+    futures = [
+        submit_llm(prompt, fallback_context, site=site)
+        for prompt, fallback_context in zip(prompts, fallback_contexts)
+    ]
+    return [future.result() for future in futures]
+
+
+# ===============================
+# STREAMING CALLS
+# ===============================
+def stream_llm(prompt, fallback_context=None, site=DEFAULT_SITE):
+    """
+    Streaming variant of call_llm: yields text chunks as they arrive.
+    Cached responses are yielded in one chunk.
+    If the API is unavailable before the first token, yields the fallback.
+    Streams carry no usage block, so their token counts are estimated.
+    """
+    start = time.perf_counter()
+    api_key = os.getenv("OPENAI_API_KEY")
+    fallback_reason = "no_api_key"
+
+    if api_key:
+        parts = []
+        first_token_s = None
+        session_id = current_session.get()
+        response = None
+
+        try:
+            key = ResponseCache.make_key(MODEL_NAME, TEMPERATURE, SYSTEM_MESSAGE, prompt)
+            cached = _response_cache.get(key)
+            telemetry.record_cache(site, hit=cached is not None)
+
+            if cached is not None:
+                telemetry.record_call(site, "cache", time.perf_counter() - start)
+                yield cached
+                return
+
+            openai.api_key = api_key
+            request_start = time.perf_counter()
+
+            response = _create_completion(prompt, site, session_id, stream=True)
+
+            for chunk in response:
+                delta = chunk["choices"][0].get("delta", {}).get("content")
+                if delta:
+                    if first_token_s is None:
+                        first_token_s = time.perf_counter() - request_start
+                    parts.append(delta)
+                    yield delta
+
+            breaker.record_success()
+            content = "".join(parts)
+            _response_cache.set(key, content)
+            prompt_tokens = estimate_tokens(SYSTEM_MESSAGE + prompt)
+            completion_tokens = estimate_tokens(content)
+            telemetry.record_tokens(site, prompt_tokens, completion_tokens)
+            scheduler.charge(session_id, prompt_tokens + completion_tokens)
+
+            if _recorder:
+                _recorder.record(
+                    key, prompt, content, time.perf_counter() - request_start,
+                    first_token_s=first_token_s,
+                    usage={"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens},
+                    stream=True
+                )
+            telemetry.record_call(site, "upstream", time.perf_counter() - start)
+            return
+
+        except SchedulerRejected as exc:
+            fallback_reason = exc.reason
+
+        except CircuitOpen:
+            fallback_reason = "circuit_open"
+
+        except Exception as exc:
+            logger.debug("LLM call failed, falling back (site=%s): %r", site, exc)
+            telemetry.record_error(site, exc)
+            fallback_reason = "error"
+
+            # the stream broke after it opened (errors before that are counted already)
+            if response is not None:
+                if is_transient(exc):
+                    breaker.record_failure()
+                else:
+                    breaker.record_success()
+
+            # text already shown cannot be taken back; keep the partial answer
+            if parts:
+                telemetry.record_call(site, "upstream", time.perf_counter() - start)
+                return
+
+    telemetry.record_fallback(site, fallback_reason)
+    telemetry.record_call(site, "fallback", time.perf_counter() - start)
+    yield _fallback_response(fallback_context)
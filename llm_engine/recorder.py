@@ -0,0 +1,64 @@
+import json
+import os
+import threading
+import time
+
+# ===============================
+# RESPONSE RECORDING (RECORD / REPLAY)
+# Upstream answers are appended to a JSONL file keyed by prompt hash
+# (ResponseCache.make_key), with the latency observed at the client.
+# llm_engine/stub_server.py --replay serves them back with the same timing.
+# ===============================
+
+
+class ResponseRecorder:
+    """
+    Append-only JSONL log of upstream responses.
+    Never raises: write errors only lose the record.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def record(self, key, prompt, content, latency_s, first_token_s=None, usage=None, stream=False):
+        entry = {
+            "key": key,
+            "prompt": prompt,
+            "content": content,
+            "latency_s": round(latency_s, 4),
+            "first_token_s": round(first_token_s, 4) if first_token_s is not None else None,
+            "prompt_tokens": (usage or {}).get("prompt_tokens"),
+            "completion_tokens": (usage or {}).get("completion_tokens"),
+            "stream": stream,
+            "recorded_at": time.time(),
+        }
+        line = json.dumps(entry, ensure_ascii=False) + "\n"
+
+        try:
+            with self._lock:
+                directory = os.path.dirname(self.path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(line)
+        except OSError:
+            pass
+
+
+def load_recording(path):
+    """
+    {prompt hash: entry} from a recording; the latest entry per hash wins.
+    """
+    entries = {}
+    with open(path, encoding="utf-8") as f:
+        for line_no, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"{path}:{line_no}: invalid recording line ({e})")
+            entries[entry["key"]] = entry
+    return entries
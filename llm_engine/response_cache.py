@@ -0,0 +1,164 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+
+class ResponseCache:
+    """
+    Process-wide, on-disk cache of LLM responses.
+    SQLite backed, bounded by entry count, with TTL and LRU eviction.
+    Never raises: storage errors behave like a cache miss, and a cache
+    that cannot be opened (e.g. read-only directory) is disabled.
+    """
+
+    def __init__(self, path, max_entries=2000, ttl_seconds=7 * 24 * 3600):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = None
+        self.disabled = False
+
+    # -------------------------------
+    # KEYS
+    # -------------------------------
+    @staticmethod
+    def make_key(model, temperature, system_message, prompt):
+        payload = json.dumps(
+            [model, temperature, system_message, prompt],
+            ensure_ascii=False
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    # -------------------------------
+    # STORAGE
+    # -------------------------------
+    def _connect(self):
+        if self.disabled:
+            raise sqlite3.OperationalError(f"response cache disabled: {self.path}")
+        if self._conn is None:
+            try:
+                self._conn = self._open()
+            except (sqlite3.Error, OSError):
+                self.disabled = True
+                raise
+        return self._conn
+
+    def _open(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=5, check_same_thread=False)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_access REAL NOT NULL
+                )
+                """
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_responses_last_access "
+                "ON responses (last_access)"
+            )
+            conn.commit()
+        except sqlite3.Error:
+            conn.close()
+            raise
+        return conn
+
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            try:
+                conn = self._connect()
+                row = conn.execute(
+                    "SELECT value, created_at FROM responses WHERE key = ?",
+                    (key,)
+                ).fetchone()
+
+                if row is not None and now - row[1] > self.ttl_seconds:
+                    conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    conn.commit()
+                    row = None
+
+                if row is None:
+                    self.misses += 1
+                    return None
+
+                conn.execute(
+                    "UPDATE responses SET last_access = ? WHERE key = ?",
+                    (now, key)
+                )
+                conn.commit()
+                self.hits += 1
+                return row[0]
+
+            except (sqlite3.Error, OSError):
+                self.misses += 1
+                return None
+
+    def set(self, key, value):
+        now = time.time()
+        with self._lock:
+            try:
+                conn = self._connect()
+                conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, value, created_at, last_access) "
+                    "VALUES (?, ?, ?, ?)",
+                    (key, value, now, now)
+                )
+                conn.execute(
+                    "DELETE FROM responses WHERE created_at < ?",
+                    (now - self.ttl_seconds,)
+                )
+                # LRU eviction beyond the size bound
+                conn.execute(
+                    """
+                    DELETE FROM responses WHERE key IN (
+                        SELECT key FROM responses
+                        ORDER BY last_access DESC
+                        LIMIT -1 OFFSET ?
+                    )
+                    """,
+                    (self.max_entries,)
+                )
+                conn.commit()
+            except (sqlite3.Error, OSError):
+                pass
+
+    def clear(self):
+        with self._lock:
+            try:
+                conn = self._connect()
+                conn.execute("DELETE FROM responses")
+                conn.commit()
+            except (sqlite3.Error, OSError):
+                pass
+
+    def stats(self):
+        with self._lock:
+            try:
+                entries = self._connect().execute(
+                    "SELECT COUNT(*) FROM responses"
+                ).fetchone()[0]
+            except (sqlite3.Error, OSError):
+                entries = None
+
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": entries,
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "disabled": self.disabled,
+            }
@@ -0,0 +1,280 @@
+import contextvars
+import heapq
+import itertools
+import os
+import queue
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+
+# ===============================
+# LLM REQUEST SCHEDULER
+# Process-wide admission control for upstream LLM requests:
+# - token buckets for requests / tokens per minute (provider limits)
+# - a token budget per user session
+# - waiting requests are admitted by priority, then arrival order
+# ===============================
+REQUESTS_PER_MINUTE = int(os.getenv("LLM_RPM", "500"))
+TOKENS_PER_MINUTE = int(os.getenv("LLM_TPM", "200000"))
+BURST_SECONDS = 10                 # bucket size: this many seconds of the per-minute rate
+SESSION_TOKEN_BUDGET = int(os.getenv("LLM_SESSION_TOKEN_BUDGET", "60000"))
+MAX_TRACKED_SESSIONS = 10000
+MAX_QUEUE_WAIT = 20                # seconds before a waiting request falls back
+
+INTERACTIVE = 0                    # the user is waiting on the answer
+STANDARD = 1
+ADVISORY = 2                       # nice-to-have text next to a result
+
+SITE_PRIORITIES = {
+    "problem_understanding": INTERACTIVE,
+    "train_test": STANDARD,
+    "model_planning": STANDARD,
+    "cleaning_guidance": STANDARD,
+    "time_series_check": STANDARD,
+    "viz_advice": ADVISORY,
+    "plot_explanation": ADVISORY,
+}
+
+# session the current request is made for (copied into worker threads by submit_llm)
+current_session = contextvars.ContextVar("llm_session", default=None)
+
+
+def set_session(session_id):
+    current_session.set(session_id)
+
+
+def priority_for(site):
+    return SITE_PRIORITIES.get(site, STANDARD)
+
+
+class SchedulerRejected(Exception):
+    """
+    The request was not sent upstream; `reason` becomes the fallback reason.
+    """
+
+    def __init__(self, reason, message):
+        super().__init__(message)
+        self.reason = reason
+
+
+class TokenBucket:
+    """
+    Not thread-safe on its own; LLMScheduler holds its lock around it.
+    """
+
+    def __init__(self, per_minute, burst_seconds=BURST_SECONDS):
+        self.rate = per_minute / 60.0
+        self.capacity = max(1.0, self.rate * burst_seconds)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount, now):
+        """
+        Seconds until `amount` is available (0 if it is now).
+        Requests larger than the bucket only need a full bucket.
+        """
+        self._refill(now)
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.rate
+
+    def take(self, amount):
+        self.tokens -= min(amount, self.capacity)
+
+
+class LLMScheduler:
+    def __init__(
+        self,
+        requests_per_minute=REQUESTS_PER_MINUTE,
+        tokens_per_minute=TOKENS_PER_MINUTE,
+        session_budget=SESSION_TOKEN_BUDGET,
+        max_wait=MAX_QUEUE_WAIT,
+    ):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.session_budget = session_budget
+        self.max_wait = max_wait
+
+        self._cond = threading.Condition()
+        self._queue = []                       # (priority, seq) of waiting requests
+        self._seq = itertools.count()
+        self._session_used = OrderedDict()     # session id -> tokens used (LRU bounded)
+        self._stats = {
+            "admitted": 0,
+            "rejected_budget": 0,
+            "rejected_timeout": 0,
+            "queued": 0,
+            "wait_seconds_sum": 0.0,
+            "wait_seconds_max": 0.0,
+        }
+
+    # -------------------------------
+    # ADMISSION
+    # -------------------------------
+    def acquire(self, site, estimated_tokens, session_id=None):
+        """
+        Block until the request may go upstream; returns the seconds waited.
+        estimated_tokens is what the provider counts against the limit
+        (prompt estimate + max completion tokens).
+        Raises SchedulerRejected if the session is over budget or the wait
+        exceeds max_wait.
+        """
+        self.check_budget(session_id)
+
+        start = time.monotonic()
+        deadline = start + self.max_wait
+        entry = (priority_for(site), next(self._seq))
+
+        with self._cond:
+            heapq.heappush(self._queue, entry)
+            waited = False
+
+            try:
+                while True:
+                    now = time.monotonic()
+                    if self._queue[0] == entry:
+                        delay = max(
+                            self.requests.wait_time(1, now),
+                            self.tokens.wait_time(estimated_tokens, now),
+                        )
+                        if delay == 0:
+                            self.requests.take(1)
+                            self.tokens.take(estimated_tokens)
+                            break
+                    else:
+                        delay = None               # woken when the queue head moves
+
+                    if now >= deadline:
+                        self._stats["rejected_timeout"] += 1
+                        raise SchedulerRejected(
+                            "rate_limited",
+                            f"No LLM capacity within {self.max_wait}s"
+                        )
+
+                    waited = True
+                    remaining = deadline - now
+                    self._cond.wait(remaining if delay is None else min(delay, remaining))
+            finally:
+                self._queue.remove(entry)
+                heapq.heapify(self._queue)
+                self._cond.notify_all()
+
+            elapsed = time.monotonic() - start
+            self._stats["admitted"] += 1
+            self._stats["queued"] += int(waited)
+            self._stats["wait_seconds_sum"] += elapsed
+            self._stats["wait_seconds_max"] = max(self._stats["wait_seconds_max"], elapsed)
+            return elapsed
+
+    # -------------------------------
+    # SESSION BUDGETS
+    # -------------------------------
+    def check_budget(self, session_id):
+        """
+        Raise SchedulerRejected("session_budget") if the session has used
+        up its token budget.
+        """
+        if session_id is None or not self.session_budget:
+            return
+        with self._cond:
+            if self._session_used.get(session_id, 0) < self.session_budget:
+                return
+            self._stats["rejected_budget"] += 1
+        raise SchedulerRejected(
+            "session_budget",
+            f"Session LLM token budget of {self.session_budget} used up"
+        )
+
+    def charge(self, session_id, tokens):
+        """
+        Count tokens actually used by a finished request against its session.
+        """
+        if session_id is None:
+            return
+        with self._cond:
+            used = self._session_used.pop(session_id, 0) + int(tokens or 0)
+            self._session_used[session_id] = used
+            while len(self._session_used) > MAX_TRACKED_SESSIONS:
+                self._session_used.popitem(last=False)
+
+    def session_used(self, session_id):
+        with self._cond:
+            return self._session_used.get(session_id, 0)
+
+    # -------------------------------
+    # STATS
+    # -------------------------------
+    def stats(self):
+        with self._cond:
+            now = time.monotonic()
+            self.requests.wait_time(0, now)
+            self.tokens.wait_time(0, now)
+            return dict(
+                self._stats,
+                waiting=len(self._queue),
+                request_tokens_available=round(self.requests.tokens, 1),
+                tpm_tokens_available=round(self.tokens.tokens),
+                sessions_tracked=len(self._session_used),
+            )
+
+
+class PriorityExecutor:
+    """
+    Fixed pool of worker threads that take jobs by priority, then arrival
+    order, so an interactive call is not stuck behind queued advisory ones.
+    Workers start on the first submit in each process: a process forked
+    after import inherits the object but none of its threads.
+    """
+
+    def __init__(self, max_workers, thread_name_prefix="worker"):
+        self.max_workers = max_workers
+        self.thread_name_prefix = thread_name_prefix
+        self._seq = itertools.count()
+        self._start_lock = threading.Lock()
+        self._jobs = None
+        self._pid = None
+
+    def _ensure_workers(self):
+        pid = os.getpid()
+        if self._pid == pid:
+            return self._jobs
+
+        with self._start_lock:
+            if self._pid != pid:
+                # fresh queue: the parent's may be locked by a thread that is gone
+                jobs = queue.PriorityQueue()
+                for i in range(self.max_workers):
+                    threading.Thread(
+                        target=self._work,
+                        args=(jobs,),
+                        name=f"{self.thread_name_prefix}_{i}",
+                        daemon=True
+                    ).start()
+                self._jobs = jobs
+                self._pid = pid
+        return self._jobs
+
+    def submit(self, priority, fn, *args, **kwargs):
+        future = Future()
+        self._ensure_workers().put((priority, next(self._seq), future, fn, args, kwargs))
+        return future
+
+    @staticmethod
+    def _work(jobs):
+        while True:
+            _, _, future, fn, args, kwargs = jobs.get()
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(fn(*args, **kwargs))
+            except BaseException as exc:
+                future.set_exception(exc)
+
+
+scheduler = LLMScheduler()
@@ -0,0 +1,351 @@
+"""
+Local stand-in for the chat-completions API (standard library only), for
+load-testing the LLM path without a key or network access.
+
+    python -m llm_engine.stub_server --port 8790 --latency lognormal:0.8,0.4 --tokens-per-second 40
+    OPENAI_API_BASE=http://127.0.0.1:8790/v1 OPENAI_API_KEY=stub streamlit run app.py
+
+Serves POST /v1/chat/completions (JSON, or SSE with "stream": true) and
+GET /stats (request / injection counters).
+
+Timing of one answer: time to first token drawn from --latency, then the
+completion at --tokens-per-second (streamed token by token, or as one JSON
+body once it is "generated").
+
+Latency specs (seconds):
+    fixed:0.5   uniform:0.2,1.5   lognormal:<median>,<sigma>   exponential:<mean>
+
+Fault injection, as fractions of requests:
+    --error-rate       500 / 503 server errors
+    --rate-limit-rate  429 rate-limit errors
+    --timeout-rate     hang for --hang-seconds (past the client's timeout)
+
+Record / replay: run the app against the real API with
+LLM_RECORD_PATH=recording.jsonl, then start this server with
+--replay recording.jsonl. Recorded prompts get their recorded answer and
+latency; other prompts get a synthetic answer. Use a fresh LLM_CACHE_PATH
+for both runs, or the response cache answers before any request is sent.
+"""
+import argparse
+import json
+import math
+import random
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from llm_engine.recorder import load_recording
+from llm_engine.response_cache import ResponseCache
+from llm_engine.telemetry import estimate_tokens
+
+# ===============================
+# SERVER SETTINGS
+# ===============================
+STUB_HOST = "127.0.0.1"
+STUB_PORT = 8790
+DEFAULT_LATENCY = "lognormal:0.8,0.4"
+DEFAULT_TOKENS_PER_SECOND = 40.0
+DEFAULT_COMPLETION_TOKENS = 150
+DEFAULT_HANG_SECONDS = 30.0
+
+FILLER_WORDS = (
+    "check the target distribution first, then compare a simple baseline "
+    "against one stronger model using the same validation split and keep "
+    "the preprocessing inside the pipeline to avoid leakage"
+).split()
+
+
+def parse_latency(spec):
+    """
+    Latency spec -> sampler(rng) returning seconds (>= 0).
+    """
+    name, _, args = spec.partition(":")
+    try:
+        values = [float(v) for v in args.split(",") if v.strip()]
+    except ValueError:
+        raise ValueError(f"Invalid latency spec: {spec!r}")
+
+    if name == "fixed" and len(values) == 1:
+        return lambda rng: values[0]
+    if name == "uniform" and len(values) == 2:
+        return lambda rng: rng.uniform(values[0], values[1])
+    if name == "lognormal" and len(values) == 2 and values[0] > 0:
+        return lambda rng: rng.lognormvariate(math.log(values[0]), values[1])
+    if name == "exponential" and len(values) == 1 and values[0] > 0:
+        return lambda rng: rng.expovariate(1.0 / values[0])
+    raise ValueError(f"Invalid latency spec: {spec!r}")
+
+
+def split_tokens(text):
+    """
+    Word-sized pieces (with their trailing whitespace) to stream one by one.
+    """
+    return re.findall(r"\S+\s*|\s+", text)
+
+
+def synthetic_answer(prompt, completion_tokens):
+    """
+    Deterministic answer of about completion_tokens tokens.
+    JSON prompts get JSON the app's parsers accept.
+    """
+    words = max(1, int(completion_tokens * 0.75))
+    text = " ".join(FILLER_WORDS[i % len(FILLER_WORDS)] for i in range(words))
+
+    if "STRICT JSON" in prompt:
+        return json.dumps({
+            "ml_type": "ml",
+            "task_type": "classification",
+            "target_type": "categorical",
+            "reasoning": text,
+        })
+    return text
+
+
+class StubConfig:
+    def __init__(
+        self,
+        latency=DEFAULT_LATENCY,
+        tokens_per_second=DEFAULT_TOKENS_PER_SECOND,
+        completion_tokens=DEFAULT_COMPLETION_TOKENS,
+        error_rate=0.0,
+        rate_limit_rate=0.0,
+        timeout_rate=0.0,
+        hang_seconds=DEFAULT_HANG_SECONDS,
+        replay=None,
+        seed=None,
+    ):
+        self.sample_latency = parse_latency(latency)
+        self.tokens_per_second = tokens_per_second
+        self.completion_tokens = completion_tokens
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.timeout_rate = timeout_rate
+        self.hang_seconds = hang_seconds
+        self.recording = load_recording(replay) if replay else {}
+
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.counts = {
+            "requests": 0,
+            "streamed": 0,
+            "errors_injected": 0,
+            "rate_limits_injected": 0,
+            "timeouts_injected": 0,
+            "replay_hits": 0,
+            "replay_misses": 0,
+        }
+
+    def count(self, name):
+        with self._lock:
+            self.counts[name] += 1
+
+    def draw(self):
+        """
+        (fault or None, time to first token) for one request.
+        """
+        with self._lock:
+            roll = self._rng.random()
+            ttft = max(0.0, self.sample_latency(self._rng))
+            status = self._rng.choice((500, 503))
+
+        if roll < self.timeout_rate:
+            return "timeout", ttft
+        roll -= self.timeout_rate
+        if roll < self.rate_limit_rate:
+            return 429, ttft
+        roll -= self.rate_limit_rate
+        if roll < self.error_rate:
+            return status, ttft
+        return None, ttft
+
+
+# ===============================
+# REQUEST HANDLING
+# ===============================
+class StubRequestHandler(BaseHTTPRequestHandler):
+    server_version = "LLMStub/1.0"
+    config = None
+
+    def do_GET(self):
+        if self.path.rstrip("/") == "/stats":
+            with self.config._lock:
+                self._send_json(200, dict(self.config.counts))
+        else:
+            self._send_error(404, f"Unknown endpoint: GET {self.path}", "invalid_request_error")
+
+    def do_POST(self):
+        if self.path.rstrip("/") not in ("/v1/chat/completions", "/chat/completions"):
+            self._send_error(404, f"Unknown endpoint: POST {self.path}", "invalid_request_error")
+            return
+
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            self._send_error(400, "Request body is not valid JSON", "invalid_request_error")
+            return
+
+        config = self.config
+        config.count("requests")
+        fault, ttft = config.draw()
+
+        try:
+            if fault == "timeout":
+                config.count("timeouts_injected")
+                time.sleep(config.hang_seconds)
+                self._send_error(504, "Upstream timed out (stub)", "server_error")
+            elif fault == 429:
+                config.count("rate_limits_injected")
+                time.sleep(min(ttft, 0.05))
+                self._send_error(429, "Rate limit reached (stub)", "requests", code="rate_limit_exceeded")
+            elif fault:
+                config.count("errors_injected")
+                time.sleep(ttft)
+                self._send_error(fault, "Injected server error (stub)", "server_error")
+            else:
+                self._answer(body, ttft)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # the client gave up (e.g. its request timeout)
+
+    def _answer(self, body, ttft):
+        config = self.config
+        messages = body.get("messages") or []
+        system = next((m["content"] for m in messages if m.get("role") == "system"), None)
+        prompt = messages[-1]["content"] if messages else ""
+        model = body.get("model", "stub-model")
+
+        key = ResponseCache.make_key(model, body.get("temperature"), system, prompt)
+        recorded = config.recording.get(key)
+        if config.recording:
+            config.count("replay_hits" if recorded else "replay_misses")
+
+        if recorded:
+            content = recorded["content"]
+            tokens = split_tokens(content)
+            if recorded.get("first_token_s") is not None:
+                ttft = recorded["first_token_s"]
+                gap = max(0.0, recorded["latency_s"] - ttft) / max(len(tokens), 1)
+            else:
+                # non-streamed recording: keep its total latency
+                gap = min(1.0 / config.tokens_per_second, recorded["latency_s"] / max(len(tokens), 1))
+                ttft = max(0.0, recorded["latency_s"] - gap * len(tokens))
+        else:
+            content = synthetic_answer(prompt, config.completion_tokens)
+            tokens = split_tokens(content)
+            gap = 1.0 / config.tokens_per_second
+
+        usage = {
+            "prompt_tokens": estimate_tokens((system or "") + prompt),
+            "completion_tokens": (recorded or {}).get("completion_tokens") or estimate_tokens(content),
+        }
+        usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+        completion_id = f"chatcmpl-stub-{uuid.uuid4().hex[:12]}"
+
+        time.sleep(ttft)
+
+        if not body.get("stream"):
+            time.sleep(gap * len(tokens))
+            self._send_json(200, {
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": content},
+                    "finish_reason": "stop",
+                }],
+                "usage": usage,
+            })
+            return
+
+        config.count("streamed")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+
+        def event(delta, finish_reason=None):
+            chunk = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+            }
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+            self.wfile.flush()
+
+        event({"role": "assistant"})
+        for i, token in enumerate(tokens):
+            if i:
+                time.sleep(gap)
+            event({"content": token})
+        event({}, finish_reason="stop")
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+
+    def _send_error(self, status, message, error_type, code=None):
+        self._send_json(status, {"error": {"message": message, "type": error_type, "param": None, "code": code}})
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # keep high request rates quiet
+
+
+def make_stub_server(host=STUB_HOST, port=STUB_PORT, **config):
+    handler = type("Handler", (StubRequestHandler,), {"config": StubConfig(**config)})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default=STUB_HOST)
+    parser.add_argument("--port", type=int, default=STUB_PORT)
+    parser.add_argument("--latency", default=DEFAULT_LATENCY, help="time-to-first-token distribution")
+    parser.add_argument("--tokens-per-second", type=float, default=DEFAULT_TOKENS_PER_SECOND)
+    parser.add_argument("--completion-tokens", type=int, default=DEFAULT_COMPLETION_TOKENS)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--timeout-rate", type=float, default=0.0)
+    parser.add_argument("--hang-seconds", type=float, default=DEFAULT_HANG_SECONDS)
+    parser.add_argument("--replay", help="recording (JSONL) written with LLM_RECORD_PATH")
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+
+    server = make_stub_server(
+        args.host,
+        args.port,
+        latency=args.latency,
+        tokens_per_second=args.tokens_per_second,
+        completion_tokens=args.completion_tokens,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        timeout_rate=args.timeout_rate,
+        hang_seconds=args.hang_seconds,
+        replay=args.replay,
+        seed=args.seed,
+    )
+    replaying = f", replaying {len(server.RequestHandlerClass.config.recording)} responses" if args.replay else ""
+    print(f"LLM stub listening on http://{args.host}:{args.port}/v1{replaying}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+import bisect
+import threading
+from collections import defaultdict
+
+# ===============================
+# LLM CALL TELEMETRY
+# Per call site: latency histogram, tokens, cache hits / misses,
+# error classes and fallbacks. Process-wide, thread-safe.
+# ===============================
+LATENCY_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+CHARS_PER_TOKEN = 4               # estimate for streamed calls (no usage block)
+
+
+def estimate_tokens(text):
+    return max(1, len(text) // CHARS_PER_TOKEN) if text else 0
+
+
+def _new_site():
+    return {
+        "calls": defaultdict(int),             # by source: session_cache / cache / upstream / coalesced / fallback
+        "latency_buckets": [0] * (len(LATENCY_BUCKETS) + 1),
+        "latency_sum": 0.0,
+        "latency_count": 0,
+        "latency_max": 0.0,
+        "prompt_tokens": 0,
+        "completion_tokens": 0,
+        "cache_hits": 0,
+        "cache_misses": 0,
+        "errors": defaultdict(int),            # by exception class
+        "retries": defaultdict(int),           # by exception class of the failed attempt
+        "fallbacks": defaultdict(int),         # by reason: no_api_key / error / rate_limited / session_budget / circuit_open
+    }
+
+
+def _quantile_from_buckets(buckets, count, q):
+    """
+    Upper bound of the bucket holding the q-quantile (Prometheus-style).
+    """
+    if not count:
+        return None
+    target = q * count
+    seen = 0
+    for bound, n in zip(LATENCY_BUCKETS, buckets):
+        seen += n
+        if seen >= target:
+            return bound
+    return float("inf")
+
+
+def _label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", " ")
+
+
+class LLMTelemetry:
+    def __init__(self):
+        self._sites = defaultdict(_new_site)
+        self._lock = threading.Lock()
+
+    def record_call(self, site, source, seconds):
+        with self._lock:
+            stats = self._sites[site]
+            stats["calls"][source] += 1
+            stats["latency_buckets"][bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+            stats["latency_sum"] += seconds
+            stats["latency_count"] += 1
+            stats["latency_max"] = max(stats["latency_max"], seconds)
+
+    def record_cache(self, site, hit):
+        with self._lock:
+            self._sites[site]["cache_hits" if hit else "cache_misses"] += 1
+
+    def record_tokens(self, site, prompt_tokens, completion_tokens):
+        with self._lock:
+            self._sites[site]["prompt_tokens"] += int(prompt_tokens or 0)
+            self._sites[site]["completion_tokens"] += int(completion_tokens or 0)
+
+    def record_error(self, site, exc):
+        with self._lock:
+            self._sites[site]["errors"][type(exc).__name__] += 1
+
+    def record_retry(self, site, exc):
+        with self._lock:
+            self._sites[site]["retries"][type(exc).__name__] += 1
+
+    def record_fallback(self, site, reason):
+        with self._lock:
+            self._sites[site]["fallbacks"][reason] += 1
+
+    def reset(self):
+        with self._lock:
+            self._sites.clear()
+
+    def snapshot(self):
+        """
+        One summary row per call site (for the dev panel).
+        """
+        with self._lock:
+            rows = []
+            for site, stats in sorted(self._sites.items()):
+                count = stats["latency_count"]
+                rows.append({
+                    "site": site,
+                    "calls": count,
+                    "upstream": stats["calls"].get("upstream", 0),
+                    "coalesced": stats["calls"].get("coalesced", 0),
+                    "cache_hits": stats["cache_hits"],
+                    "cache_misses": stats["cache_misses"],
+                    "fallbacks": sum(stats["fallbacks"].values()),
+                    "errors": ", ".join(f"{name}: {n}" for name, n in sorted(stats["errors"].items())),
+                    "retries": sum(stats["retries"].values()),
+                    "prompt_tokens": stats["prompt_tokens"],
+                    "completion_tokens": stats["completion_tokens"],
+                    "latency_mean_s": round(stats["latency_sum"] / count, 4) if count else None,
+                    "latency_p95_s": _quantile_from_buckets(stats["latency_buckets"], count, 0.95),
+                    "latency_max_s": round(stats["latency_max"], 4),
+                })
+            return rows
+
+    def to_prometheus(self):
+        """
+        Prometheus text exposition format.
+        """
+        lines = []
+
+        def metric(name, kind, help_text, samples):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in samples:
+                label_text = ",".join(f'{k}="{_label(v)}"' for k, v in labels.items())
+                lines.append(f"{name}{{{label_text}}} {value}")
+
+        with self._lock:
+            sites = sorted(self._sites.items())
+
+            metric("llm_calls_total", "counter", "LLM calls by call site and answer source.", [
+                ({"site": site, "source": source}, n)
+                for site, stats in sites for source, n in sorted(stats["calls"].items())
+            ])
+
+            histogram = []
+            for site, stats in sites:
+                cumulative = 0
+                for bound, n in zip(LATENCY_BUCKETS, stats["latency_buckets"]):
+                    cumulative += n
+                    histogram.append(({"site": site, "le": bound}, cumulative))
+                histogram.append(({"site": site, "le": "+Inf"}, stats["latency_count"]))
+            lines.append("# HELP llm_call_latency_seconds End-to-end latency of LLM calls.")
+            lines.append("# TYPE llm_call_latency_seconds histogram")
+            for labels, value in histogram:
+                lines.append(f'llm_call_latency_seconds_bucket{{site="{_label(labels["site"])}",le="{labels["le"]}"}} {value}')
+            for site, stats in sites:
+                lines.append(f'llm_call_latency_seconds_sum{{site="{_label(site)}"}} {stats["latency_sum"]:.6f}')
+                lines.append(f'llm_call_latency_seconds_count{{site="{_label(site)}"}} {stats["latency_count"]}')
+
+            metric("llm_tokens_total", "counter", "Prompt / completion tokens (estimated for streams).", [
+                ({"site": site, "kind": kind}, stats[f"{kind}_tokens"])
+                for site, stats in sites for kind in ("prompt", "completion")
+            ])
+            metric("llm_cache_requests_total", "counter", "Response cache lookups.", [
+                ({"site": site, "result": result}, stats[f"cache_{result}"])
+                for site, stats in sites for result in ("hits", "misses")
+            ])
+            metric("llm_errors_total", "counter", "Failed upstream calls by exception class.", [
+                ({"site": site, "error": error}, n)
+                for site, stats in sites for error, n in sorted(stats["errors"].items())
+            ])
+            metric("llm_retries_total", "counter", "Retried upstream attempts by exception class.", [
+                ({"site": site, "error": error}, n)
+                for site, stats in sites for error, n in sorted(stats["retries"].items())
+            ])
+            metric("llm_fallbacks_total", "counter", "Calls answered by the rule-based fallback.", [
+                ({"site": site, "reason": reason}, n)
+                for site, stats in sites for reason, n in sorted(stats["fallbacks"].items())
+            ])
+
+        return "\n".join(lines) + "\n"
+
+
+telemetry = LLMTelemetry()
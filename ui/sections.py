@@ -1,5 +1,24 @@
 import streamlit as st
-from core.visualizer import get_visualization_advice
+from core.visualizer import stream_visualization_advice
+
+
+# ===============================
+# STREAMING TEXT
+# ===============================
+def stream_markdown(chunks, placeholder=None):
+    """
+    Render LLM text chunks as they arrive.
+    Returns the full text once the stream is exhausted.
+    """
+    placeholder = placeholder if placeholder is not None else st.empty()
+    text = ""
+
+    for chunk in chunks:
+        text += chunk
+        placeholder.markdown(text + "▌")
+
+    placeholder.markdown(text)
+    return text
 
 
 def show_dataset_preview(df):
@@ -59,18 +78,61 @@ def show_model_plans(plans):
 def show_visualizations(df, target_col=None, session_state=None):
     st.subheader("Data Visualization")
 
-    advice = get_visualization_advice(
-        df,
-        target_col=target_col,
-        session_state=session_state
-    )
+    advice = session_state.get("viz_advice") if session_state is not None else None
 
     if advice:
         st.caption("🤖 AI-assisted visualization guidance")
         st.markdown(advice)
+        return
+
+    try:
+        chunks = stream_visualization_advice(df, target_col=target_col)
+        st.caption("🤖 AI-assisted visualization guidance")
+        advice = stream_markdown(chunks)
+    except Exception:
+        advice = None
+
+    if advice:
+        if session_state is not None:
+            session_state["viz_advice"] = advice
     else:
         st.markdown(
             "- Distribution plots to understand feature spread\n"
             "- Correlation plots to identify relationships\n"
             "- Boxplots to inspect variability"
         )
+
+
+# ===============================
+# DEVELOPER PANEL — LLM TELEMETRY
+# ===============================
+def show_llm_telemetry(rows, prometheus_text, scheduler_stats=None, breaker_state=None):
+    st.subheader("LLM Telemetry")
+
+    if breaker_state:
+        retry = breaker_state["retry_in_seconds"]
+        st.caption(
+            f"Provider circuit: {breaker_state['state']}"
+            + (f" (probe in {retry}s)" if retry is not None else "")
+            + f", {breaker_state['consecutive_failures']} consecutive failures, "
+            f"opened {breaker_state['opened']}x, "
+            f"{breaker_state['short_circuited']} calls short-circuited"
+        )
+
+    if scheduler_stats:
+        st.caption(
+            f"Scheduler: {scheduler_stats['admitted']} admitted, "
+            f"{scheduler_stats['waiting']} waiting, "
+            f"{scheduler_stats['rejected_timeout']} rate-limited, "
+            f"{scheduler_stats['rejected_budget']} over session budget"
+        )
+
+    if not rows:
+        st.caption("No LLM calls recorded in this server process yet.")
+        return
+
+    st.dataframe(rows)
+    st.download_button("Download metrics (Prometheus text)", prometheus_text, "llm_metrics.prom")
+
+    with st.expander("Raw metrics"):
+        st.code(prometheus_text, language="text")
@@ -1,6 +1,13 @@
+import os
+
 APP_TITLE = "AI-Guided Machine Learning & Deep Learning Project Mentor"
 
-SUPPORTED_FILE_TYPES = ["csv"]
+SUPPORTED_FILE_TYPES = ["csv", "parquet"]
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# local caches (LLM responses, parsed datasets, ...)
+CACHE_DIR = os.getenv("MENTOR_CACHE_DIR", os.path.join(PROJECT_ROOT, ".cache"))
 
 DEFAULT_LLM_MODEL = "gpt-4o-mini"
 
@@ -4,6 +4,12 @@ def is_csv_file(filename):
     return filename.lower().endswith(".csv")
 
 
+def is_parquet_file(filename):
+    if not filename:
+        return False
+    return filename.lower().endswith((".parquet", ".pq"))
+
+
 def safe_lower(text):
     if not isinstance(text, str):
         return ""